@@ -160,7 +160,8 @@ async def create_subscription_offer(
     try:
         from backend.services.payment.billing_service import (
             BillingService,
-            SubscriptionTier
+            SubscriptionTier,
+            draw_tokens
         )
         
         # Map tier string to enum
@@ -181,10 +182,14 @@ async def create_subscription_offer(
             notes=offer.notes
         )
         
+        # One random draw covers both link tokens
+        payment_token, portal_token = draw_tokens(2)
+        
         # Generate secure payment link
         payment_link = BillingService.generate_secure_payment_link(
             offer_id=subscription_offer["offer_id"],
-            user_email=offer.user_email
+            user_email=offer.user_email,
+            token=payment_token
         )
         
         # Generate onboarding portal link
@@ -193,7 +198,8 @@ async def create_subscription_offer(
             offer_id=subscription_offer["offer_id"],
             include_document_upload=True,
             include_video_upload=True,
-            include_photo_upload=True
+            include_photo_upload=True,
+            token=portal_token
         )
         
         # Prepare email details
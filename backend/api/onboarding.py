@@ -350,6 +350,8 @@ async def application_approved_webhook(application_id: str):
         # Will be sent when user installs mobile app and registers device token
         push_ready = True
         
+        await notif_service.aclose()
+        
         return {
             "success": True,
             "message": f"Application {application_id} approved. Notifications sent immediately.",
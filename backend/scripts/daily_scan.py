@@ -6,6 +6,7 @@ More thorough than the 15-minute incremental scans
 """
 
 import asyncio
+import logging
 import sys
 import os
 from datetime import datetime, timedelta
@@ -155,6 +156,7 @@ async def run_daily_scan():
         
     finally:
         db.close()
+        await scraper.close()
 
 
 async def main():
@@ -167,4 +169,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Surface scraper progress and errors, which are logged rather than printed
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(main())
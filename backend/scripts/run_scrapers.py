@@ -5,6 +5,7 @@ Runs every 15 minutes via cron
 """
 
 import asyncio
+import logging
 import sys
 import os
 from datetime import datetime
@@ -112,6 +113,7 @@ async def run_monitoring_cycle():
         
     finally:
         db.close()
+        await scraper.close()
 
 
 async def main():
@@ -124,4 +126,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Surface scraper progress and errors, which are logged rather than printed
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(main())
@@ -7,7 +7,18 @@ from typing import Dict, Any, List, Optional, Tuple
 from enum import Enum
 from dataclasses import dataclass
 from datetime import datetime
-import asyncio
+from collections import defaultdict
+import string
+
+
+# Single-pass normalization table: ASCII punctuation becomes whitespace so
+# token boundaries survive, then the result is casefolded
+_PUNCTUATION_TABLE = str.maketrans({c: " " for c in string.punctuation})
+
+
+def normalize_text(text: str) -> str:
+    """Strip punctuation and casefold text before tokenization/matching"""
+    return text.translate(_PUNCTUATION_TABLE).casefold()
 
 
 class Language(Enum):
@@ -110,6 +121,18 @@ class LanguageDetector:
         Returns:
             LanguageDetectionResult with detected language
         """
+        return self._detect(text, top_n)
+    
+    async def detect_languages(
+        self,
+        texts: List[str],
+        top_n: int = 3
+    ) -> List[LanguageDetectionResult]:
+        """Detect language of many texts in a single pass"""
+        return [self._detect(text, top_n) for text in texts]
+    
+    def _detect(self, text: str, top_n: int) -> LanguageDetectionResult:
+        """Score text against language patterns"""
         if not text:
             return LanguageDetectionResult(
                 language="en",
@@ -117,7 +140,7 @@ class LanguageDetector:
                 alternative_languages=[]
             )
         
-        text_lower = text.lower()
+        text_lower = normalize_text(text)
         scores = {}
         
         # Score each language based on pattern matching
@@ -195,6 +218,15 @@ class TranslationService:
         Returns:
             TranslationResult with translated text
         """
+        return self._translate(text, source_lang, target_lang)
+    
+    def _translate(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str
+    ) -> TranslationResult:
+        """Translate a single text (demo word mapping)"""
         if source_lang == target_lang:
             return TranslationResult(
                 original_text=text,
@@ -211,7 +243,7 @@ class TranslationService:
         # Check demo translations
         lang_pair = (source_lang, target_lang)
         if lang_pair in self.demo_translations:
-            words = text.lower().split()
+            words = normalize_text(text).split()
             translated_words = [
                 self.demo_translations[lang_pair].get(word, word)
                 for word in words
@@ -233,13 +265,11 @@ class TranslationService:
         source_lang: str,
         target_lang: str
     ) -> List[TranslationResult]:
-        """Translate multiple texts in parallel"""
-        tasks = [
-            self.translate(text, source_lang, target_lang)
+        """Translate multiple texts for one language pair in a single call"""
+        return [
+            self._translate(text, source_lang, target_lang)
             for text in texts
         ]
-        
-        return await asyncio.gather(*tasks)
 
 
 class CulturalSentimentAnalyzer:
@@ -306,6 +336,18 @@ class CulturalSentimentAnalyzer:
         Returns:
             CulturalSentimentResult with culturally-adjusted sentiment
         """
+        return self._analyze(text, language)
+    
+    async def analyze_sentiment_batch(
+        self,
+        texts: List[str],
+        language: str
+    ) -> List[CulturalSentimentResult]:
+        """Analyze sentiment for a group of texts sharing one language"""
+        return [self._analyze(text, language) for text in texts]
+    
+    def _analyze(self, text: str, language: str) -> CulturalSentimentResult:
+        """Lexicon-based sentiment scoring with cultural adjustment"""
         # Get cultural context
         cultural_context = self.cultural_contexts.get(
             language,
@@ -316,7 +358,7 @@ class CulturalSentimentAnalyzer:
         positive_words = ["good", "great", "excellent", "wonderful", "happy"]
         negative_words = ["bad", "terrible", "awful", "sad", "angry"]
         
-        text_lower = text.lower()
+        text_lower = normalize_text(text)
         
         pos_count = sum(1 for word in positive_words if word in text_lower)
         neg_count = sum(1 for word in negative_words if word in text_lower)
@@ -379,6 +421,18 @@ class MultilingualEntityExtractor:
         Returns:
             Dictionary of entity types and their values
         """
+        return self._extract(text)
+    
+    async def extract_entities_batch(
+        self,
+        texts: List[str],
+        language: str
+    ) -> List[Dict[str, List[str]]]:
+        """Extract entities for a group of texts sharing one language"""
+        return [self._extract(text) for text in texts]
+    
+    def _extract(self, text: str) -> Dict[str, List[str]]:
+        """Capitalization heuristic entity extraction"""
         # Simplified extraction (would use NER models in production)
         entities = {
             "persons": [],
@@ -452,13 +506,82 @@ class CrossLingualService:
             detection.language
         )
         
+        return self._build_result(
+            content, detection, translation, sentiment, entities
+        )
+    
+    async def process_multilingual_mentions(
+        self,
+        mentions: List[Dict[str, Any]],
+        target_language: str = "en"
+    ) -> List[Dict[str, Any]]:
+        """
+        Process a batch of mentions stage by stage
+        
+        1. Detect language for all mentions in one call
+        2. Group mentions by detected language
+        3. Translate each group with one batch call per language pair
+        4. Analyze sentiment and extract entities once per group
+        
+        Returns:
+            Processed mentions in the same order as the input
+        """
+        contents = [mention.get("content", "") for mention in mentions]
+        detections = await self.language_detector.detect_languages(contents)
+        
+        by_lang: Dict[str, List[int]] = defaultdict(list)
+        for i, detection in enumerate(detections):
+            by_lang[detection.language].append(i)
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(mentions)
+        
+        for language, indices in by_lang.items():
+            texts = [contents[i] for i in indices]
+            
+            translations: List[Optional[TranslationResult]] = [None] * len(texts)
+            if language != target_language:
+                translations = await self.translation_service.translate_batch(
+                    texts,
+                    language,
+                    target_language
+                )
+            
+            sentiments = await self.sentiment_analyzer.analyze_sentiment_batch(
+                texts,
+                language
+            )
+            entities = await self.entity_extractor.extract_entities_batch(
+                texts,
+                language
+            )
+            
+            for j, i in enumerate(indices):
+                results[i] = self._build_result(
+                    texts[j],
+                    detections[i],
+                    translations[j],
+                    sentiments[j],
+                    entities[j]
+                )
+        
+        return results
+    
+    def _build_result(
+        self,
+        content: str,
+        detection: LanguageDetectionResult,
+        translation: Optional[TranslationResult],
+        sentiment: CulturalSentimentResult,
+        entities: Dict[str, List[str]]
+    ) -> Dict[str, Any]:
+        """Assemble the processed mention payload"""
         return {
             "original_content": content,
             "detected_language": detection.language,
             "language_confidence": detection.confidence,
             "translation": {
-                "text": translation.translated_text if translation else content,
-                "confidence": translation.confidence if translation else 1.0
+                "text": translation.translated_text,
+                "confidence": translation.confidence
             } if translation else None,
             "sentiment": {
                 "value": sentiment.sentiment,
@@ -9,14 +9,159 @@ Total cost: $0-$50/month
 """
 
 import os
+import gzip
+import time
+import random
 import asyncio
-from typing import Dict, List, Optional
+import logging
+import base64
+import functools
+from typing import Any, Dict, List, Optional, Tuple
+from collections import defaultdict
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+from html import escape
+from types import MappingProxyType
 import aiohttp
 import json
 
+logger = logging.getLogger(__name__)
+
+# Try to use orjson for faster payload encoding, but don't fail if not available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# httpx (with h2) enables the optional HTTP/2 transport
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP-dates are ignored)"""
+    if not value:
+        return None
+    try:
+        return min(max(float(value), 0.0), RETRY_MAX_DELAY)
+    except ValueError:
+        return None
+
+
+def _json_bytes(payload: Dict) -> bytes:
+    """Serialize a request payload straight to JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode()
+
+
+# Backoff for 429/5xx provider responses (seconds)
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+
+# SendGrid request bodies at least this large are sent gzip-compressed
+GZIP_MIN_BYTES = 1024
+
+# FCM multicast accepts at most 1000 registration tokens per request
+FCM_MAX_TOKENS_PER_REQUEST = 1000
+
+# SendGrid free tier quota and per-request personalization cap
+SENDGRID_DAILY_LIMIT = 100
+SENDGRID_MAX_PERSONALIZATIONS = 1000
+
+# Repeated threat alerts within this window are suppressed (non-critical)
+ALERT_DEDUP_WINDOW_SECONDS = 300
+
+# Alert banner colors by severity
+SEVERITY_COLORS = MappingProxyType({
+    'critical': '#dc2626',
+    'high': '#ea580c',
+    'medium': '#f59e0b',
+    'low': '#10b981'
+})
+DEFAULT_SEVERITY_COLOR = '#6366f1'
+
+# Static email markup, built once at import; only the placeholders vary
+_EMAIL_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+</head>
+<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f3f4f6;">
+    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f3f4f6; padding: 40px 0;">
+        <tr>
+            <td align="center">
+                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
+                    
+                    <!-- Header -->
+                    <tr>
+                        <td style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; text-align: center;">
+                            <h1 style="color: #ffffff; margin: 0; font-size: 24px; font-weight: 700;">
+                                🛡️ AI Reputation Guardian
+                            </h1>
+                        </td>
+                    </tr>
+                    
+                    <!-- Alert Banner -->
+                    <tr>
+                        <td style="background-color: {color}; padding: 20px; text-align: center;">
+                            <p style="color: #ffffff; margin: 0; font-size: 16px; font-weight: 600; text-transform: uppercase; letter-spacing: 1px;">
+                                {severity_upper} ALERT
+                            </p>
+                        </td>
+                    </tr>
+                    
+                    <!-- Content -->
+                    <tr>
+                        <td style="padding: 40px 30px;">
+                            <h2 style="color: #1f2937; margin: 0 0 20px 0; font-size: 20px; font-weight: 600;">
+                                {subject}
+                            </h2>
+                            
+                            <p style="color: #4b5563; margin: 0 0 20px 0; font-size: 16px; line-height: 1.6;">
+                                {message}
+                            </p>
+                            
+                            {data_section}
+                        </td>
+                    </tr>
+                    
+                    <!-- Action Button -->
+                    <tr>
+                        <td style="padding: 0 30px 40px 30px; text-align: center;">
+                            <a href="{url}" style="display: inline-block; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: #ffffff; padding: 14px 32px; text-decoration: none; border-radius: 8px; font-weight: 600; font-size: 16px;">
+                                View Dashboard
+                            </a>
+                        </td>
+                    </tr>
+                    
+                    <!-- Footer -->
+                    <tr>
+                        <td style="background-color: #f9fafb; padding: 30px; text-align: center; border-top: 1px solid #e5e7eb;">
+                            <p style="color: #6b7280; margin: 0 0 10px 0; font-size: 14px;">
+                                AI Reputation & Identity Guardian
+                            </p>
+                            <p style="color: #9ca3af; margin: 0; font-size: 12px;">
+                                Protecting your reputation 24/7
+                            </p>
+                        </td>
+                    </tr>
+                    
+                </table>
+            </td>
+        </tr>
+    </table>
+</body>
+</html>
+        """
+
 
 class NotificationChannel(Enum):
     """Notification delivery channels"""
@@ -33,7 +178,7 @@ class NotificationPriority(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NotificationPreferences:
     """User notification preferences"""
     user_id: str
@@ -56,7 +201,7 @@ class NotificationPreferences:
     instant_alerts: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class Notification:
     """Notification message"""
     user_id: str
@@ -64,11 +209,239 @@ class Notification:
     message: str
     priority: NotificationPriority
     data: Dict
-    timestamp: datetime = None
+    timestamp: int = 0  # Unix epoch nanoseconds (UTC)
     
     def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.utcnow()
+        if not self.timestamp:
+            self.timestamp = time.time_ns()
+    
+    @property
+    def dt(self) -> datetime:
+        """Timestamp as a naive UTC datetime, for rendering"""
+        return datetime.fromtimestamp(self.timestamp / 1_000_000_000, timezone.utc).replace(tzinfo=None)
+
+# Optional email data blocks, rendered in order when their key is present
+_DATA_SECTION_TEMPLATES = (
+    # Threat details
+    ('threat_type', """
+                <div style="background-color: #fef3c7; border-left: 4px solid #f59e0b; padding: 15px; margin: 20px 0; border-radius: 4px;">
+                    <p style="margin: 0; color: #92400e; font-weight: 600;">Threat Type:</p>
+                    <p style="margin: 5px 0 0 0; color: #78350f;">{threat_type}</p>
+                </div>
+            """),
+    # Source information
+    ('source_url', """
+                <div style="background-color: #e0e7ff; border-left: 4px solid #6366f1; padding: 15px; margin: 20px 0; border-radius: 4px;">
+                    <p style="margin: 0; color: #3730a3; font-weight: 600;">Source:</p>
+                    <p style="margin: 5px 0 0 0; color: #4338ca;">
+                        <a href="{source_url}" style="color: #4338ca; text-decoration: underline;">
+                            {source_platform}
+                        </a>
+                    </p>
+                </div>
+            """),
+    # Confidence score
+    ('confidence', """
+                <div style="background-color: #f3f4f6; padding: 15px; margin: 20px 0; border-radius: 4px;">
+                    <p style="margin: 0; color: #374151; font-weight: 600;">AI Confidence:</p>
+                    <p style="margin: 5px 0 0 0; color: #1f2937; font-size: 24px; font-weight: 700;">
+                        {confidence_pct}%
+                    </p>
+                </div>
+            """),
+)
+
+
+@dataclass(slots=True, frozen=True)
+class NotifConfig:
+    """Provider credentials for the notification service"""
+    sendgrid_api_key: Optional[str] = None
+    from_email: str = 'alerts@yourcompany.com'
+    twilio_account_sid: Optional[str] = None
+    twilio_auth_token: Optional[str] = None
+    twilio_from_number: Optional[str] = None
+    fcm_server_key: Optional[str] = None
+    
+    @classmethod
+    def from_env(cls) -> "NotifConfig":
+        """Load credentials from environment variables"""
+        return cls(
+            sendgrid_api_key=os.getenv('SENDGRID_API_KEY'),
+            from_email=os.getenv('FROM_EMAIL', 'alerts@yourcompany.com'),
+            twilio_account_sid=os.getenv('TWILIO_ACCOUNT_SID'),
+            twilio_auth_token=os.getenv('TWILIO_AUTH_TOKEN'),
+            twilio_from_number=os.getenv('TWILIO_FROM_NUMBER'),
+            fcm_server_key=os.getenv('FCM_SERVER_KEY')
+        )
+
+
+# Read once at import; pass an explicit NotifConfig to override
+CONFIG = NotifConfig.from_env()
+
+
+class TokenBucket:
+    """
+    Client-side token-bucket rate limiter
+    
+    Holds up to `capacity` tokens refilled at `refill_per_sec`; `acquire`
+    waits until enough tokens are available so bursts are paced before they
+    turn into provider 429s.
+    """
+    
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self, n: float = 1) -> None:
+        """Take `n` tokens, sleeping until they are available"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.refill_per_sec
+                )
+                self._updated = now
+                
+                if self._tokens >= n:
+                    self._tokens -= n
+                    return
+                
+                await asyncio.sleep((n - self._tokens) / self.refill_per_sec)
+
+
+class NotificationBatcher:
+    """
+    Coalesce bursts of notifications into batched provider calls
+    
+    Items are queued with a future; a background task drains up to
+    `max_batch_size` items (or whatever arrived within `max_wait` seconds),
+    groups them by channel and sends each group in as few requests as
+    possible. Pushes and emails with identical content share a single
+    FCM multicast / SendGrid request.
+    """
+    
+    def __init__(
+        self,
+        service: "FreeNotificationService",
+        max_batch_size: int = 50,
+        max_wait: float = 0.2
+    ):
+        self.service = service
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def submit(self, channel: str, **kwargs) -> bool:
+        """Queue a send for `channel` and wait for its delivery result"""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._flush_loop())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((channel, kwargs, future))
+        return await future
+    
+    async def flush(self) -> None:
+        """Wait until every queued notification has been sent"""
+        if self._queue is not None:
+            await self._queue.join()
+    
+    async def close(self) -> None:
+        """Flush pending notifications and stop the background task"""
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _flush_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self._dispatch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def _dispatch(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]) -> None:
+        """Send one drained batch, grouped by channel"""
+        push_groups: Dict[Tuple, List[Tuple[Dict[str, Any], asyncio.Future]]] = defaultdict(list)
+        email_groups: Dict[Tuple, List[Tuple[Dict[str, Any], asyncio.Future]]] = defaultdict(list)
+        singles = []
+        
+        for channel, kwargs, future in batch:
+            data_key = json.dumps(kwargs.get('data') or {}, sort_keys=True, default=str)
+            if channel == 'push':
+                key = (kwargs['title'], kwargs['message'], data_key)
+                push_groups[key].append((kwargs, future))
+            elif channel == 'email':
+                key = (kwargs['subject'], kwargs['message'], data_key)
+                email_groups[key].append((kwargs, future))
+            else:
+                singles.append((channel, kwargs, future))
+        
+        async def send_push_group(items):
+            first = items[0][0]
+            results = await self.service.send_push_bulk(
+                [kwargs['token'] for kwargs, _ in items],
+                first['title'],
+                first['message'],
+                first.get('data')
+            )
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+        
+        async def send_email_group(items):
+            first = items[0][0]
+            results = await self.service.send_email_bulk(
+                [(kwargs['to_email'], {}) for kwargs, _ in items],
+                first['subject'],
+                first['message'],
+                first.get('data')
+            )
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+        
+        async def send_single(channel, kwargs, future):
+            result = await self.service.send_sms(**kwargs)
+            if not future.done():
+                future.set_result(result)
+        
+        await asyncio.gather(
+            *(send_push_group(items) for items in push_groups.values()),
+            *(send_email_group(items) for items in email_groups.values()),
+            *(send_single(*item) for item in singles),
+            return_exceptions=True
+        )
+        
+        # Any future left unresolved belongs to a group that raised
+        for _, _, future in batch:
+            if not future.done():
+                future.set_result(False)
 
 
 class FreeNotificationService:
@@ -84,24 +457,244 @@ class FreeNotificationService:
            $0.01-$1/month for SMS (if enabled)
     """
     
-    def __init__(self):
-        """Initialize with environment variables"""
+    def __init__(self, config: Optional[NotifConfig] = None, use_http2: bool = False):
+        """
+        Initialize from provider credentials
+        
+        `config` defaults to the module-level CONFIG loaded from the
+        environment at import time. Set `use_http2` to send SendGrid and FCM traffic over a multiplexed
+        HTTP/2 httpx client (requires `httpx[http2]`); Twilio always uses
+        the pooled aiohttp session.
+        """
+        config = config or CONFIG
+        
         # SendGrid (FREE - 100 emails/day)
-        self.sendgrid_api_key = os.getenv('SENDGRID_API_KEY')
-        self.from_email = os.getenv('FROM_EMAIL', 'alerts@yourcompany.com')
+        self.sendgrid_api_key = config.sendgrid_api_key
+        self.from_email = config.from_email
         
         # Twilio (Optional - costs $0.0075/SMS)
-        self.twilio_account_sid = os.getenv('TWILIO_ACCOUNT_SID')
-        self.twilio_auth_token = os.getenv('TWILIO_AUTH_TOKEN')
-        self.twilio_from_number = os.getenv('TWILIO_FROM_NUMBER')
+        self.twilio_account_sid = config.twilio_account_sid
+        self.twilio_auth_token = config.twilio_auth_token
+        self.twilio_from_number = config.twilio_from_number
+        self._twilio_auth_header = (
+            'Basic ' + base64.b64encode(
+                f"{self.twilio_account_sid}:{self.twilio_auth_token}".encode()
+            ).decode()
+            if self.twilio_account_sid and self.twilio_auth_token else None
+        )
         
         # Firebase Cloud Messaging (FREE forever)
-        self.fcm_server_key = os.getenv('FCM_SERVER_KEY')
+        self.fcm_server_key = config.fcm_server_key
         
-        # Stats
+        # Stats (reset every 24 hours)
         self.emails_sent_today = 0
         self.sms_sent_today = 0
         self.push_sent_today = 0
+        self.alerts_suppressed_today = 0
+        self._stats_window_start = datetime.utcnow()
+        self._email_counter_lock = asyncio.Lock()
+        
+        # Shared HTTP session (created lazily, reused across all sends)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+        
+        # Optional HTTP/2 client for providers that support multiplexing
+        self.use_http2 = use_http2 and HTTPX_AVAILABLE
+        self._http2_client = None
+        
+        # Per-provider request pacing (SendGrid allows small bursts)
+        self._email_bucket = TokenBucket(capacity=3, refill_per_sec=3)
+        self._sms_bucket = TokenBucket(capacity=1, refill_per_sec=1)
+        self._push_bucket = TokenBucket(capacity=100, refill_per_sec=100)
+        
+        # Recently sent threat alerts (dedup key -> monotonic send time)
+        self._recent_alerts: Dict[str, float] = {}
+        
+        # Coalesces non-critical alerts into batched sends
+        self._batcher = NotificationBatcher(self)
+        
+        # Bounded worker pool for sustained alert fan-out (see start_workers)
+        self._alert_queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+    
+    
+    async def __aenter__(self) -> "FreeNotificationService":
+        return self
+    
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+    
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            async with self._session_lock:
+                if self._session is None or self._session.closed:
+                    self._session = aiohttp.ClientSession(
+                        connector=aiohttp.TCPConnector(
+                            limit=50,
+                            limit_per_host=20,
+                            ttl_dns_cache=300,
+                            keepalive_timeout=60
+                        ),
+                        timeout=aiohttp.ClientTimeout(total=10)
+                    )
+        return self._session
+    
+    
+    def _get_http2_client(self):
+        """Return the shared HTTP/2 client, creating it on first use"""
+        if self._http2_client is None:
+            self._http2_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=25),
+                timeout=10.0
+            )
+        return self._http2_client
+    
+    
+    async def _post(
+        self,
+        url: str,
+        *,
+        headers: Dict[str, str],
+        data,
+        http2: bool = False,
+        max_retries: int = 3
+    ) -> Tuple[int, str]:
+        """
+        POST through the pooled transport and return (status, body text)
+        
+        429 and 5xx responses are retried up to `max_retries` times with
+        full-jitter exponential backoff, honoring `Retry-After` when the
+        provider sends one. Requests marked `http2` use the HTTP/2 client
+        when it is enabled.
+        """
+        for attempt in range(max_retries + 1):
+            status, body, retry_after = await self._post_once(
+                url, headers=headers, data=data, http2=http2
+            )
+            if (status != 429 and status < 500) or attempt == max_retries:
+                return status, body
+            
+            delay = _parse_retry_after(retry_after)
+            if delay is None:
+                delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+            logger.warning(
+                "⚠️  %s returned %d, retrying in %.2fs (attempt %d/%d)",
+                url, status, delay, attempt + 1, max_retries
+            )
+            await asyncio.sleep(delay)
+    
+    
+    async def _post_once(
+        self,
+        url: str,
+        *,
+        headers: Dict[str, str],
+        data,
+        http2: bool = False
+    ) -> Tuple[int, str, Optional[str]]:
+        """Single POST returning (status, body text, Retry-After header)"""
+        if http2 and self.use_http2:
+            client = self._get_http2_client()
+            response = await client.post(url, headers=headers, content=data)
+            return response.status_code, response.text, response.headers.get('Retry-After')
+        
+        session = await self._get_session()
+        async with session.post(url, headers=headers, data=data) as response:
+            return response.status, await response.text(), response.headers.get('Retry-After')
+    
+    
+    async def start_workers(self, n: int = 16, max_queue_size: int = 1000) -> None:
+        """
+        Start `n` workers that send alerts queued with `enqueue_alert`
+        
+        Keep `n` close to the connector limit so the pool stays saturated
+        without opening thousands of concurrent sends.
+        """
+        if self._workers:
+            return
+        
+        self._alert_queue = asyncio.Queue(maxsize=max_queue_size)
+        self._workers = [
+            asyncio.create_task(self._alert_worker())
+            for _ in range(n)
+        ]
+    
+    
+    async def enqueue_alert(
+        self,
+        preferences: NotificationPreferences,
+        notification: Notification
+    ) -> None:
+        """Queue an alert for the worker pool (waits while the queue is full)"""
+        if not self._workers:
+            await self.start_workers()
+        await self._alert_queue.put((preferences, notification))
+    
+    
+    async def stop_workers(self) -> None:
+        """Wait for queued alerts to be sent, then stop the workers"""
+        if not self._workers:
+            return
+        
+        await self._alert_queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._alert_queue = None
+    
+    
+    async def _alert_worker(self) -> None:
+        while True:
+            preferences, notification = await self._alert_queue.get()
+            try:
+                await self.send_alert(preferences, notification)
+            except Exception as e:
+                logger.error("❌ Alert worker error: %s", e)
+            finally:
+                self._alert_queue.task_done()
+    
+    
+    async def aclose(self) -> None:
+        """Drain queued alerts and close the pooled HTTP clients"""
+        await self.stop_workers()
+        await self._batcher.close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._http2_client is not None:
+            await self._http2_client.aclose()
+            self._http2_client = None
+    
+    
+    def _roll_daily_window(self) -> None:
+        """Reset the daily counters once the 24-hour window has elapsed"""
+        now = datetime.utcnow()
+        if now - self._stats_window_start >= timedelta(hours=24):
+            self._stats_window_start = now
+            self.emails_sent_today = 0
+            self.sms_sent_today = 0
+            self.push_sent_today = 0
+            self.alerts_suppressed_today = 0
+    
+    
+    async def _reserve_email_quota(self, requested: int) -> int:
+        """Atomically reserve up to `requested` emails from today's quota"""
+        async with self._email_counter_lock:
+            self._roll_daily_window()
+            granted = max(0, min(requested, SENDGRID_DAILY_LIMIT - self.emails_sent_today))
+            self.emails_sent_today += granted
+            return granted
+    
+    
+    async def _release_email_quota(self, count: int) -> None:
+        """Return reserved quota for emails that were not delivered"""
+        async with self._email_counter_lock:
+            self.emails_sent_today = max(0, self.emails_sent_today - count)
     
     
     async def send_alert(
@@ -114,35 +707,53 @@ class FreeNotificationService:
         
         Returns dict with success status for each channel
         """
-        results = {}
+        channels = []
+        tasks = []
+        
+        # Critical alerts go out immediately; everything else is coalesced
+        if notification.priority == NotificationPriority.CRITICAL:
+            send_email, send_sms, send_push = self.send_email, self.send_sms, self.send_push
+        else:
+            send_email = functools.partial(self._batcher.submit, 'email')
+            send_sms = functools.partial(self._batcher.submit, 'sms')
+            send_push = functools.partial(self._batcher.submit, 'push')
         
         # Send email (FREE - SendGrid 100/day)
         if preferences.email_enabled and preferences.email:
-            results['email'] = await self.send_email(
+            channels.append('email')
+            tasks.append(send_email(
                 to_email=preferences.email,
                 subject=f"[{notification.priority.value.upper()}] {notification.title}",
                 message=notification.message,
                 data=notification.data
-            )
+            ))
         
         # Send SMS (COSTS MONEY - only for critical alerts or if enabled)
         if (preferences.sms_enabled and preferences.phone and 
             notification.priority == NotificationPriority.CRITICAL):
-            results['sms'] = await self.send_sms(
+            channels.append('sms')
+            tasks.append(send_sms(
                 to_phone=preferences.phone,
                 message=f"{notification.title}: {notification.message}"
-            )
+            ))
         
         # Send push notification (FREE - Firebase)
         if preferences.push_enabled and preferences.push_token:
-            results['push'] = await self.send_push(
+            channels.append('push')
+            tasks.append(send_push(
                 token=preferences.push_token,
                 title=notification.title,
                 message=notification.message,
                 data=notification.data
-            )
+            ))
         
-        return results
+        # Channels are independent, so dispatch them concurrently
+        done = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        return {
+            channel: result is True
+            for channel, result in zip(channels, done)
+        }
     
     
     async def send_email(
@@ -157,24 +768,82 @@ class FreeNotificationService:
         
         Get API key: https://sendgrid.com/free/
         """
+        results = await self.send_email_bulk([(to_email, {})], subject, message, data)
+        return results[0]
+    
+    
+    async def send_email_bulk(
+        self,
+        recipients: List[Tuple[str, Dict[str, str]]],
+        subject: str,
+        message: str,
+        data: Dict = None
+    ) -> List[bool]:
+        """
+        Send one email to many recipients in a single SendGrid request
+        
+        Each recipient is `(email, substitutions)`; substitution tags
+        (e.g. `-name-`) in the subject or body are replaced per recipient
+        by SendGrid. Up to 1000 recipients share one API call.
+        
+        Returns per-recipient success flags in the same order as `recipients`
+        """
+        if not recipients:
+            return []
+        
         if not self.sendgrid_api_key:
-            print("⚠️  SendGrid API key not configured")
-            return False
+            logger.warning("⚠️  SendGrid API key not configured")
+            return [False] * len(recipients)
         
-        if self.emails_sent_today >= 100:
-            print("⚠️  Daily SendGrid limit reached (100 emails)")
-            return False
+        granted = await self._reserve_email_quota(len(recipients))
+        if granted == 0:
+            logger.warning("⚠️  Daily SendGrid limit reached (%d emails)", SENDGRID_DAILY_LIMIT)
+            return [False] * len(recipients)
+        
+        allowed = recipients[:granted]
+        results: List[bool] = []
+        
+        # Build the HTML once for every recipient
+        html_content = self._create_email_html(subject, message, data)
+        
+        for start in range(0, len(allowed), SENDGRID_MAX_PERSONALIZATIONS):
+            batch = allowed[start:start + SENDGRID_MAX_PERSONALIZATIONS]
+            batch_results = await self._send_email_batch(
+                batch, subject, message, html_content
+            )
+            if not all(batch_results):
+                await self._release_email_quota(len(batch))
+            results.extend(batch_results)
+        
+        if len(allowed) < len(recipients):
+            logger.warning("⚠️  Daily SendGrid limit reached (%d emails)", SENDGRID_DAILY_LIMIT)
+            results.extend([False] * (len(recipients) - len(allowed)))
+        
+        return results
+    
+    
+    async def _send_email_batch(
+        self,
+        recipients: List[Tuple[str, Dict[str, str]]],
+        subject: str,
+        message: str,
+        html_content: str
+    ) -> List[bool]:
+        """Send one SendGrid request (at most 1000 personalizations)"""
+        personalizations = []
+        for to_email, substitutions in recipients:
+            personalization = {
+                "to": [{"email": to_email}],
+                "subject": subject
+            }
+            if substitutions:
+                personalization["substitutions"] = substitutions
+            personalizations.append(personalization)
         
         try:
-            # Create HTML email
-            html_content = self._create_email_html(subject, message, data)
-            
             # SendGrid API payload
             payload = {
-                "personalizations": [{
-                    "to": [{"email": to_email}],
-                    "subject": subject
-                }],
+                "personalizations": personalizations,
                 "from": {"email": self.from_email},
                 "content": [
                     {
@@ -188,28 +857,35 @@ class FreeNotificationService:
                 ]
             }
             
+            headers = {
+                'Authorization': f'Bearer {self.sendgrid_api_key}',
+                'Content-Type': 'application/json'
+            }
+            request_body = _json_bytes(payload)
+            
+            # Compress the HTML-heavy body; tiny payloads aren't worth the CPU
+            if len(request_body) >= GZIP_MIN_BYTES:
+                request_body = gzip.compress(request_body, compresslevel=5)
+                headers['Content-Encoding'] = 'gzip'
+            
             # Send via SendGrid API
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    'https://api.sendgrid.com/v3/mail/send',
-                    headers={
-                        'Authorization': f'Bearer {self.sendgrid_api_key}',
-                        'Content-Type': 'application/json'
-                    },
-                    json=payload
-                ) as response:
-                    if response.status == 202:
-                        self.emails_sent_today += 1
-                        print(f"✅ Email sent to {to_email}")
-                        return True
-                    else:
-                        error = await response.text()
-                        print(f"❌ Email failed: {error}")
-                        return False
+            await self._email_bucket.acquire()
+            status, body = await self._post(
+                'https://api.sendgrid.com/v3/mail/send',
+                headers=headers,
+                data=request_body,
+                http2=True
+            )
+            if status == 202:
+                logger.info("✅ Email sent to %d recipient(s)", len(recipients))
+                return [True] * len(recipients)
+            else:
+                logger.error("❌ Email failed: %s", body)
+                return [False] * len(recipients)
         
         except Exception as e:
-            print(f"❌ Email error: {e}")
-            return False
+            logger.error("❌ Email error: %s", e)
+            return [False] * len(recipients)
     
     
     async def send_sms(
@@ -226,7 +902,7 @@ class FreeNotificationService:
         Get credentials: https://www.twilio.com/try-twilio
         """
         if not all([self.twilio_account_sid, self.twilio_auth_token, self.twilio_from_number]):
-            print("⚠️  Twilio credentials not configured")
+            logger.warning("⚠️  Twilio credentials not configured")
             return False
         
         try:
@@ -241,28 +917,23 @@ class FreeNotificationService:
             }
             
             # Send via Twilio API
-            import base64
-            auth = base64.b64encode(
-                f"{self.twilio_account_sid}:{self.twilio_auth_token}".encode()
-            ).decode()
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url,
-                    headers={'Authorization': f'Basic {auth}'},
-                    data=payload
-                ) as response:
-                    if response.status in [200, 201]:
-                        self.sms_sent_today += 1
-                        print(f"✅ SMS sent to {to_phone} (Cost: $0.0075)")
-                        return True
-                    else:
-                        error = await response.text()
-                        print(f"❌ SMS failed: {error}")
-                        return False
+            await self._sms_bucket.acquire()
+            status, body = await self._post(
+                url,
+                headers={'Authorization': self._twilio_auth_header},
+                data=payload
+            )
+            if status in [200, 201]:
+                self._roll_daily_window()
+                self.sms_sent_today += 1
+                logger.info("✅ SMS sent to %s (Cost: $0.0075)", to_phone)
+                return True
+            else:
+                logger.error("❌ SMS failed: %s", body)
+                return False
         
         except Exception as e:
-            print(f"❌ SMS error: {e}")
+            logger.error("❌ SMS error: %s", e)
             return False
     
     
@@ -279,14 +950,54 @@ class FreeNotificationService:
         Get server key: https://console.firebase.google.com/
         Project Settings → Cloud Messaging → Server Key
         """
+        results = await self.send_push_bulk([token], title, message, data)
+        return results[0]
+    
+    
+    async def send_push_bulk(
+        self,
+        tokens: List[str],
+        title: str,
+        message: str,
+        data: Dict = None
+    ) -> List[bool]:
+        """
+        Send the same push notification to many devices
+        
+        Uses FCM multicast (`registration_ids`), so each request covers up
+        to 1000 device tokens instead of one round trip per token.
+        
+        Returns per-token success flags in the same order as `tokens`
+        """
+        if not tokens:
+            return []
+        
         if not self.fcm_server_key:
-            print("⚠️  Firebase FCM server key not configured")
-            return False
+            logger.warning("⚠️  Firebase FCM server key not configured")
+            return [False] * len(tokens)
         
+        results: List[bool] = []
+        for start in range(0, len(tokens), FCM_MAX_TOKENS_PER_REQUEST):
+            batch = tokens[start:start + FCM_MAX_TOKENS_PER_REQUEST]
+            results.extend(
+                await self._send_push_batch(batch, title, message, data)
+            )
+        
+        return results
+    
+    
+    async def _send_push_batch(
+        self,
+        tokens: List[str],
+        title: str,
+        message: str,
+        data: Dict = None
+    ) -> List[bool]:
+        """Send one FCM multicast request (at most 1000 tokens)"""
         try:
             # FCM API payload
             payload = {
-                "to": token,
+                "registration_ids": tokens,
                 "notification": {
                     "title": title,
                     "body": message,
@@ -298,124 +1009,54 @@ class FreeNotificationService:
             }
             
             # Send via FCM API
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    'https://fcm.googleapis.com/fcm/send',
-                    headers={
-                        'Authorization': f'key={self.fcm_server_key}',
-                        'Content-Type': 'application/json'
-                    },
-                    json=payload
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        if result.get('success') == 1:
-                            self.push_sent_today += 1
-                            print(f"✅ Push notification sent")
-                            return True
-                        else:
-                            print(f"❌ Push failed: {result}")
-                            return False
-                    else:
-                        error = await response.text()
-                        print(f"❌ Push failed: {error}")
-                        return False
+            await self._push_bucket.acquire()
+            status, body = await self._post(
+                'https://fcm.googleapis.com/fcm/send',
+                headers={
+                    'Authorization': f'key={self.fcm_server_key}',
+                    'Content-Type': 'application/json'
+                },
+                data=_json_bytes(payload),
+                http2=True
+            )
+            if status == 200:
+                result = json.loads(body)
+                delivered = [
+                    'message_id' in item
+                    for item in result.get('results', [])
+                ]
+                delivered += [False] * (len(tokens) - len(delivered))
+                
+                sent = sum(delivered)
+                self._roll_daily_window()
+                self.push_sent_today += sent
+                if sent:
+                    logger.info("✅ Push notification sent to %d/%d devices", sent, len(tokens))
+                if sent < len(tokens):
+                    logger.error("❌ Push failed: %s", result)
+                return delivered
+            else:
+                logger.error("❌ Push failed: %s", body)
+                return [False] * len(tokens)
         
         except Exception as e:
-            print(f"❌ Push error: {e}")
-            return False
+            logger.error("❌ Push error: %s", e)
+            return [False] * len(tokens)
     
     
     def _create_email_html(self, subject: str, message: str, data: Dict = None) -> str:
-        """Create HTML email template"""
-        
-        # Determine severity color
-        severity_colors = {
-            'critical': '#dc2626',
-            'high': '#ea580c',
-            'medium': '#f59e0b',
-            'low': '#10b981'
-        }
+        """Create HTML email from the precompiled template"""
+        data = data or {}
+        severity = data.get('severity', 'medium')
         
-        severity = data.get('severity', 'medium') if data else 'medium'
-        color = severity_colors.get(severity, '#6366f1')
-        
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f3f4f6;">
-    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f3f4f6; padding: 40px 0;">
-        <tr>
-            <td align="center">
-                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-                    
-                    <!-- Header -->
-                    <tr>
-                        <td style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; text-align: center;">
-                            <h1 style="color: #ffffff; margin: 0; font-size: 24px; font-weight: 700;">
-                                🛡️ AI Reputation Guardian
-                            </h1>
-                        </td>
-                    </tr>
-                    
-                    <!-- Alert Banner -->
-                    <tr>
-                        <td style="background-color: {color}; padding: 20px; text-align: center;">
-                            <p style="color: #ffffff; margin: 0; font-size: 16px; font-weight: 600; text-transform: uppercase; letter-spacing: 1px;">
-                                {severity.upper()} ALERT
-                            </p>
-                        </td>
-                    </tr>
-                    
-                    <!-- Content -->
-                    <tr>
-                        <td style="padding: 40px 30px;">
-                            <h2 style="color: #1f2937; margin: 0 0 20px 0; font-size: 20px; font-weight: 600;">
-                                {subject}
-                            </h2>
-                            
-                            <p style="color: #4b5563; margin: 0 0 20px 0; font-size: 16px; line-height: 1.6;">
-                                {message}
-                            </p>
-                            
-                            {self._create_data_section(data) if data else ''}
-                        </td>
-                    </tr>
-                    
-                    <!-- Action Button -->
-                    <tr>
-                        <td style="padding: 0 30px 40px 30px; text-align: center;">
-                            <a href="{data.get('url', '#') if data else '#'}" style="display: inline-block; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: #ffffff; padding: 14px 32px; text-decoration: none; border-radius: 8px; font-weight: 600; font-size: 16px;">
-                                View Dashboard
-                            </a>
-                        </td>
-                    </tr>
-                    
-                    <!-- Footer -->
-                    <tr>
-                        <td style="background-color: #f9fafb; padding: 30px; text-align: center; border-top: 1px solid #e5e7eb;">
-                            <p style="color: #6b7280; margin: 0 0 10px 0; font-size: 14px;">
-                                AI Reputation & Identity Guardian
-                            </p>
-                            <p style="color: #9ca3af; margin: 0; font-size: 12px;">
-                                Protecting your reputation 24/7
-                            </p>
-                        </td>
-                    </tr>
-                    
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>
-        """
-        
-        return html
+        return _EMAIL_HTML_TEMPLATE.format_map({
+            'color': SEVERITY_COLORS.get(severity, DEFAULT_SEVERITY_COLOR),
+            'severity_upper': escape(severity.upper()),
+            'subject': escape(subject),
+            'message': escape(message),
+            'data_section': self._create_data_section(data),
+            'url': escape(data.get('url', '#'))
+        })
     
     
     def _create_data_section(self, data: Dict) -> str:
@@ -423,43 +1064,18 @@ class FreeNotificationService:
         if not data:
             return ""
         
-        sections = []
-        
-        # Threat details
-        if 'threat_type' in data:
-            sections.append(f"""
-                <div style="background-color: #fef3c7; border-left: 4px solid #f59e0b; padding: 15px; margin: 20px 0; border-radius: 4px;">
-                    <p style="margin: 0; color: #92400e; font-weight: 600;">Threat Type:</p>
-                    <p style="margin: 5px 0 0 0; color: #78350f;">{data['threat_type']}</p>
-                </div>
-            """)
-        
-        # Source information
-        if 'source_url' in data:
-            sections.append(f"""
-                <div style="background-color: #e0e7ff; border-left: 4px solid #6366f1; padding: 15px; margin: 20px 0; border-radius: 4px;">
-                    <p style="margin: 0; color: #3730a3; font-weight: 600;">Source:</p>
-                    <p style="margin: 5px 0 0 0; color: #4338ca;">
-                        <a href="{data['source_url']}" style="color: #4338ca; text-decoration: underline;">
-                            {data.get('source_platform', 'View Source')}
-                        </a>
-                    </p>
-                </div>
-            """)
-        
-        # Confidence score
-        if 'confidence' in data:
-            confidence_pct = int(data['confidence'] * 100)
-            sections.append(f"""
-                <div style="background-color: #f3f4f6; padding: 15px; margin: 20px 0; border-radius: 4px;">
-                    <p style="margin: 0; color: #374151; font-weight: 600;">AI Confidence:</p>
-                    <p style="margin: 5px 0 0 0; color: #1f2937; font-size: 24px; font-weight: 700;">
-                        {confidence_pct}%
-                    </p>
-                </div>
-            """)
+        values = {
+            'threat_type': escape(str(data.get('threat_type', ''))),
+            'source_url': escape(str(data.get('source_url', ''))),
+            'source_platform': escape(str(data.get('source_platform', 'View Source'))),
+            'confidence_pct': int(data['confidence'] * 100) if 'confidence' in data else 0
+        }
         
-        return ''.join(sections)
+        return ''.join(
+            template.format_map(values)
+            for key, template in _DATA_SECTION_TEMPLATES
+            if key in data
+        )
     
     
     async def send_welcome_email(self, user_email: str, user_name: str) -> bool:
@@ -502,25 +1118,64 @@ The AI Guardian Team
         preferences: NotificationPreferences,
         threat_details: Dict
     ) -> Dict[str, bool]:
-        """Send immediate threat alert"""
+        """
+        Send immediate threat alert
+        
+        Repeats of the same threat (same user, threat type and source) within
+        ALERT_DEDUP_WINDOW_SECONDS are suppressed unless severity is critical.
+        Returns an empty dict for suppressed alerts.
+        """
+        priority = NotificationPriority[threat_details['severity'].upper()]
+        
+        if self._is_duplicate_alert(preferences.user_id, threat_details, priority):
+            self._roll_daily_window()
+            self.alerts_suppressed_today += 1
+            return {}
         
         notification = Notification(
             user_id=preferences.user_id,
             title=f"⚠️ {threat_details['threat_type']} Detected",
             message=threat_details['message'],
-            priority=NotificationPriority[threat_details['severity'].upper()],
+            priority=priority,
             data=threat_details
         )
         
         return await self.send_alert(preferences, notification)
     
     
+    def _is_duplicate_alert(
+        self,
+        user_id: str,
+        threat_details: Dict,
+        priority: NotificationPriority
+    ) -> bool:
+        """Check and record an alert against the recent-alert window"""
+        now = time.monotonic()
+        
+        # Purge expired entries; bounded by the alert rate
+        expired = [
+            key for key, sent_at in self._recent_alerts.items()
+            if now - sent_at >= ALERT_DEDUP_WINDOW_SECONDS
+        ]
+        for key in expired:
+            del self._recent_alerts[key]
+        
+        key = f"{user_id}|{threat_details.get('threat_type')}|{threat_details.get('source_url')}"
+        if key in self._recent_alerts and priority != NotificationPriority.CRITICAL:
+            return True
+        
+        self._recent_alerts[key] = now
+        return False
+    
+    
     def get_daily_stats(self) -> Dict:
         """Get daily notification stats"""
+        self._roll_daily_window()
         return {
             'emails_sent': self.emails_sent_today,
             'sms_sent': self.sms_sent_today,
             'push_sent': self.push_sent_today,
+            'alerts_suppressed': self.alerts_suppressed_today,
             'total_cost': self.sms_sent_today * 0.0075  # Only SMS costs money
         }
 
@@ -565,6 +1220,8 @@ async def example_usage():
     # Check daily stats
     stats = notif_service.get_daily_stats()
     print(f"Daily stats: {stats}")
+    
+    await notif_service.aclose()
 
 
 if __name__ == "__main__":
@@ -3,16 +3,42 @@ Notification & Alert System
 Real-time alerts via email, SMS, push notifications with customizable thresholds
 """
 
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Iterable, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from collections import deque
+from functools import lru_cache
+from html import escape
+from string import Template
+from urllib.parse import quote
+import asyncio
+import json
+import logging
+import time
+import aiosmtplib
 
+if TYPE_CHECKING:
+    from email.mime.multipart import MIMEMultipart
 
-class NotificationChannel(Enum):
+# Try to use orjson for faster payload encoding, but don't fail if not available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# httpx backs the webhook and Slack channels
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationChannel(str, Enum):
     """Notification delivery channels"""
     EMAIL = "email"
     SMS = "sms"
@@ -22,7 +48,7 @@ class NotificationChannel(Enum):
     TEAMS = "teams"
 
 
-class NotificationPriority(Enum):
+class NotificationPriority(str, Enum):
     """Notification priority levels"""
     LOW = "low"
     MEDIUM = "medium"
@@ -30,7 +56,7 @@ class NotificationPriority(Enum):
     URGENT = "urgent"
 
 
-@dataclass
+@dataclass(slots=True)
 class NotificationPreferences:
     """User notification preferences"""
     user_id: str
@@ -56,7 +82,7 @@ class NotificationPreferences:
     monthly_summary: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class Notification:
     """Notification message"""
     notification_id: str
@@ -72,6 +98,12 @@ class Notification:
     sent_at: Optional[datetime] = None
     read_at: Optional[datetime] = None
     
+    def to_json_bytes(self) -> bytes:
+        """JSON encoding of to_dict(), straight to bytes"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self.to_dict())
+        return json.dumps(self.to_dict()).encode()
+    
     def to_dict(self) -> Dict:
         return {
             "notification_id": self.notification_id,
@@ -89,6 +121,128 @@ class Notification:
         }
 
 
+# Lowest to highest, for picking the priority of a rolled-up summary
+_PRIORITY_ORDER = list(NotificationPriority)
+
+
+@lru_cache(maxsize=None)
+def _quiet_mask(start: int, end: int) -> int:
+    """24-bit mask of quiet hours; start > end wraps past midnight"""
+    if start < end:
+        hours = range(start, end)
+    else:
+        hours = [*range(start, 24), *range(0, end)]
+    return sum(1 << (h % 24) for h in hours)
+
+
+_PRIORITY_LABEL = {priority: priority.value.upper() for priority in NotificationPriority}
+
+_PRIORITY_COLORS = {
+    NotificationPriority.LOW: "#4CAF50",
+    NotificationPriority.MEDIUM: "#FF9800",
+    NotificationPriority.HIGH: "#FF5722",
+    NotificationPriority.URGENT: "#F44336"
+}
+
+# Parsed once at import; values are HTML-escaped by the caller
+_EMAIL_TEMPLATE = Template("""
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; line-height: 1.6; }
+                .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+                .header { background: $color; color: white; padding: 20px; border-radius: 5px 5px 0 0; }
+                .content { background: #f5f5f5; padding: 20px; }
+                .footer { background: #333; color: white; padding: 10px; text-align: center; border-radius: 0 0 5px 5px; }
+                .button { background: $color; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; }
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h2>🛡️ AI Guardian Alert</h2>
+                    <p>$title</p>
+                </div>
+                <div class="content">
+                    <p><strong>Entity:</strong> $entity</p>
+                    <p><strong>Priority:</strong> $priority</p>
+                    <p>$message</p>
+                    <br>
+                    <a href="https://app.aiguardian.com/alerts/$nid" class="button">
+                        View Details
+                    </a>
+                </div>
+                <div class="footer">
+                    <p>AI Reputation & Identity Guardian</p>
+                    <p><small>Sent at $ts</small></p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """)
+
+_REPORT_SUMMARY_TEMPLATE = """
+        Summary for {entity_name}:
+        
+        • Reputation Score: {reputation_score}/100
+        • Total Mentions: {total_mentions}
+        • Sentiment: {average_sentiment}
+        • Trend: {trend_direction}
+        
+        View full report in your dashboard.
+        """
+
+
+class PreferencesLoader:
+    """
+    Batches preference lookups: ids requested within `delay` seconds are
+    fetched together with one call to `fetch_many`
+    """
+    
+    def __init__(
+        self,
+        fetch_many: Callable[[List[str]], Awaitable[Dict[str, NotificationPreferences]]],
+        delay: float = 0.005
+    ):
+        self.fetch_many = fetch_many
+        self.delay = delay
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+    
+    async def get(self, user_id: str) -> Optional[NotificationPreferences]:
+        """Preferences for one user, fetched in the next batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(user_id, []).append(future)
+        
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.delay, self._schedule_flush)
+        return await future
+    
+    def _schedule_flush(self):
+        self._flush_handle = None
+        task = asyncio.create_task(self._flush(self._pending))
+        self._pending = {}
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _flush(self, pending: Dict[str, List[asyncio.Future]]):
+        try:
+            rows = await self.fetch_many(list(pending))
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        
+        for user_id, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(rows.get(user_id))
+
+
 class NotificationService:
     """
     Unified notification service supporting multiple channels
@@ -102,18 +256,143 @@ class NotificationService:
             config: Configuration with API keys and credentials
         """
         self.config = config
-        self.notification_queue: List[Notification] = []
-        self.sent_notifications: List[Notification] = []
+        # Bounded so a long-running service doesn't grow without limit;
+        # the quiet-hours queue holds (notification, preferences) pairs
+        self.notification_queue: deque = deque(maxlen=config.get('queue_max', 10_000))
+        # Oldest quiet-hours notifications pushed out of the full queue
+        self.dropped_notifications = 0
+        self.sent_notifications: deque = deque(maxlen=config.get('history_max', 10_000))
+        self.quiet_drain_interval = config.get('quiet_drain_interval', 60)
+        self._quiet_drainer: Optional[asyncio.Task] = None
         
         # Initialize channel handlers
         self.email_config = config.get('email', {})
         self.sms_config = config.get('sms', {})
         self.push_config = config.get('push', {})
+        
+        # Channel dispatch table (Teams has no sender yet)
+        self._channel_handlers = {
+            NotificationChannel.EMAIL: self._send_email,
+            NotificationChannel.SMS: self._send_sms,
+            NotificationChannel.PUSH: self._send_push,
+            NotificationChannel.WEBHOOK: self._send_webhook,
+            NotificationChannel.SLACK: self._send_slack
+        }
+        
+        # Batched preference lookups for scheduled reports
+        self._pref_loader = PreferencesLoader(
+            config.get('preferences_fetcher', self._fetch_preferences)
+        )
+        
+        # Shared keep-alive HTTP client for webhook/Slack (created lazily)
+        self._http = None
+        
+        # Pooled SMTP connection (connected lazily, reused across sends)
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._smtp_lock = asyncio.Lock()
+        # Reconnect after this many messages to respect provider caps
+        self.messages_per_connection = self.email_config.get('messages_per_connection', 100)
+        self._smtp_sent = 0
+        
+        # Similar non-urgent notifications are rolled up per window (seconds)
+        self.coalesce_window = config.get('coalesce_window', 60)
+        self._coalesce: Dict[tuple, List] = {}
+        self._coalesce_timers: Dict[tuple, asyncio.TimerHandle] = {}
+        self._background_tasks = set()
+        
+        # Outgoing emails are coalesced and flushed over one SMTP session
+        self.email_chunk_size = self.email_config.get('chunk_size', 50)
+        self.email_flush_interval = self.email_config.get('flush_interval', 0.05)
+        self._email_queue: Optional[asyncio.Queue] = None
+        self._email_flusher: Optional[asyncio.Task] = None
+    
+    async def _get_smtp(self) -> aiosmtplib.SMTP:
+        """Return the pooled SMTP connection, (re)connecting if needed"""
+        async with self._smtp_lock:
+            if (
+                self._smtp is not None and self._smtp.is_connected
+                and self._smtp_sent >= self.messages_per_connection
+            ):
+                try:
+                    await self._smtp.quit()
+                except aiosmtplib.SMTPException:
+                    self._smtp.close()
+                self._smtp = None
+            
+            if self._smtp is None or not self._smtp.is_connected:
+                smtp = aiosmtplib.SMTP(
+                    hostname=self.email_config.get('smtp_host', 'smtp.gmail.com'),
+                    port=self.email_config.get('smtp_port', 587),
+                    start_tls=False
+                )
+                await smtp.connect()
+                await smtp.starttls()
+                await smtp.login(
+                    self.email_config.get('username'),
+                    self.email_config.get('password')
+                )
+                self._smtp = smtp
+                self._smtp_sent = 0
+            return self._smtp
+    
+    def _get_http(self):
+        """Return the shared HTTP client, creating it on first use"""
+        if self._http is None:
+            try:
+                self._http = httpx.AsyncClient(
+                    http2=True,
+                    timeout=10.0,
+                    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+                )
+            except ImportError:
+                # h2 not installed; keep-alive still applies over HTTP/1.1
+                self._http = httpx.AsyncClient(
+                    timeout=10.0,
+                    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+                )
+        return self._http
+    
+    async def aclose(self):
+        """Flush pending summaries and queued emails, then close SMTP"""
+        for key, timer in list(self._coalesce_timers.items()):
+            timer.cancel()
+            await self._flush_coalesced(key)
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        
+        if self._quiet_drainer is not None:
+            self._quiet_drainer.cancel()
+            try:
+                await self._quiet_drainer
+            except asyncio.CancelledError:
+                pass
+            self._quiet_drainer = None
+        
+        if self._email_flusher is not None:
+            await self._email_queue.join()
+            self._email_flusher.cancel()
+            try:
+                await self._email_flusher
+            except asyncio.CancelledError:
+                pass
+            self._email_flusher = None
+        
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        
+        if self._smtp is not None and self._smtp.is_connected:
+            try:
+                await self._smtp.quit()
+            except aiosmtplib.SMTPException:
+                self._smtp.close()
+        self._smtp = None
     
     async def send_notification(
         self,
         notification: Notification,
-        preferences: NotificationPreferences
+        preferences: NotificationPreferences,
+        coalesce: bool = True
     ) -> Dict[str, bool]:
         """
         Send notification through configured channels
@@ -121,50 +400,179 @@ class NotificationService:
         Args:
             notification: Notification to send
             preferences: User preferences
+            coalesce: Allow folding into a summary (off for reports, whose
+                body must be delivered as written)
             
+        Non-urgent notifications sharing (user, entity, title prefix) within
+        the coalescing window are held back and sent as one summary when
+        the window closes; the first one in a window is sent immediately.
+        
         Returns:
-            Dictionary of channel success status
+            Dictionary of channel success status, or {"coalesced": True} when
+            the notification was accepted into a pending summary
         """
+        if (
+            coalesce
+            and notification.priority != NotificationPriority.URGENT
+            and self.coalesce_window > 0
+        ):
+            key = (
+                notification.user_id,
+                notification.entity_id,
+                notification.title.split(':')[0]
+            )
+            if key in self._coalesce:
+                self._coalesce[key].append((notification, preferences))
+                return {"coalesced": True}
+            
+            self._coalesce[key] = []
+            self._coalesce_timers[key] = asyncio.get_running_loop().call_later(
+                self.coalesce_window, self._schedule_coalesced_flush, key
+            )
+        
+        return await self._dispatch(notification, preferences)
+    
+    async def _dispatch(
+        self,
+        notification: Notification,
+        preferences: NotificationPreferences
+    ) -> Dict[str, bool]:
+        """Deliver a notification through its enabled channels"""
         results = {}
         
         # Check quiet hours
         if self._is_quiet_hours(preferences):
             if notification.priority != NotificationPriority.URGENT:
-                self.notification_queue.append(notification)
+                if len(self.notification_queue) == self.notification_queue.maxlen:
+                    dropped, _ = self.notification_queue[0]
+                    self.dropped_notifications += 1
+                    logger.warning(
+                        "Quiet-hours queue full (%d); dropping notification %s for user %s",
+                        self.notification_queue.maxlen, dropped.notification_id, dropped.user_id
+                    )
+                self.notification_queue.append((notification, preferences))
+                if self._quiet_drainer is None or self._quiet_drainer.done():
+                    self._quiet_drainer = asyncio.create_task(self._quiet_drain_loop())
                 return {"queued": True}
         
-        # Send through each channel
-        for channel in notification.channels:
-            if channel in preferences.enabled_channels:
-                try:
-                    if channel == NotificationChannel.EMAIL:
-                        results['email'] = await self._send_email(notification, preferences)
-                    elif channel == NotificationChannel.SMS:
-                        results['sms'] = await self._send_sms(notification, preferences)
-                    elif channel == NotificationChannel.PUSH:
-                        results['push'] = await self._send_push(notification, preferences)
-                    elif channel == NotificationChannel.WEBHOOK:
-                        results['webhook'] = await self._send_webhook(notification, preferences)
-                    elif channel == NotificationChannel.SLACK:
-                        results['slack'] = await self._send_slack(notification, preferences)
-                except Exception as e:
-                    results[channel.value] = False
-                    print(f"Error sending {channel.value} notification: {e}")
+        # Send through all enabled channels concurrently
+        enabled = frozenset(preferences.enabled_channels)
+        channels = [
+            channel for channel in dict.fromkeys(notification.channels)
+            if channel in enabled and channel in self._channel_handlers
+        ]
+        outcomes = await asyncio.gather(
+            *(self._channel_handlers[channel](notification, preferences) for channel in channels),
+            return_exceptions=True
+        )
+        for channel, outcome in zip(channels, outcomes):
+            if isinstance(outcome, Exception):
+                results[channel.value] = False
+                print(f"Error sending {channel.value} notification: {outcome}")
+            else:
+                results[channel.value] = outcome
         
         notification.sent_at = datetime.now()
         self.sent_notifications.append(notification)
         
         return results
     
+    async def drain_quiet_queue(self) -> int:
+        """Resend queued notifications whose quiet hours have ended"""
+        sent = 0
+        for _ in range(len(self.notification_queue)):
+            notification, preferences = self.notification_queue.popleft()
+            if self._is_quiet_hours(preferences):
+                self.notification_queue.append((notification, preferences))
+                continue
+            await self._dispatch(notification, preferences)
+            sent += 1
+        return sent
+    
+    async def _quiet_drain_loop(self):
+        """Periodically drain the quiet-hours queue until it is empty"""
+        while self.notification_queue:
+            await asyncio.sleep(self.quiet_drain_interval)
+            await self.drain_quiet_queue()
+    
+    def _schedule_coalesced_flush(self, key: tuple):
+        """Timer callback: send the summary for a closed coalescing window"""
+        task = asyncio.create_task(self._flush_coalesced(key))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _flush_coalesced(self, key: tuple):
+        """Send held-back notifications for `key` as a single summary"""
+        self._coalesce_timers.pop(key, None)
+        events = self._coalesce.pop(key, [])
+        if not events:
+            return
+        
+        notification = events[0][0] if len(events) == 1 else self._summarize(
+            [event for event, _ in events]
+        )
+        await self._dispatch(notification, events[-1][1])
+    
+    def _summarize(self, events: List[Notification]) -> Notification:
+        """Roll several similar notifications up into one"""
+        first = events[0]
+        prefix = first.title.split(':')[0]
+        
+        payloads = [e.data for e in events]
+        spikes = [
+            d['spike_percentage'] for d in payloads
+            if isinstance(d.get('spike_percentage'), (int, float))
+        ]
+        sources = sorted({str(d['source']) for d in payloads if d.get('source')})
+        
+        channels = []
+        for event in events:
+            for channel in event.channels:
+                if channel not in channels:
+                    channels.append(channel)
+        
+        message = f"{len(events)} {prefix.lower()} events in the last {self.coalesce_window:g}s"
+        if spikes:
+            message += f", peak +{max(spikes):g}%"
+        if sources:
+            message += f" (sources: {', '.join(sources)})"
+        
+        return Notification(
+            notification_id=f"{first.notification_id}_summary",
+            user_id=first.user_id,
+            entity_id=first.entity_id,
+            entity_name=first.entity_name,
+            priority=max((e.priority for e in events), key=_PRIORITY_ORDER.index),
+            title=f"{prefix}: {len(events)} events",
+            message=message,
+            data={
+                'event_count': len(events),
+                'spike_percentage_max': max(spikes) if spikes else None,
+                'spike_percentage_mean': sum(spikes) / len(spikes) if spikes else None,
+                'sources': sources,
+                'notification_ids': [e.notification_id for e in events]
+            },
+            channels=channels,
+            created_at=datetime.now()
+        )
+    
     async def _send_email(self, notification: Notification, preferences: NotificationPreferences) -> bool:
         """Send email notification"""
         if not preferences.email_address:
             return False
         
+        # SMTP login would fail anyway; skip building the message
+        if not self.email_config.get('username'):
+            return False
+        
+        # Imported on first send; processes that never email skip the cost
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+        
         try:
             # Create email message
             msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"[{notification.priority.value.upper()}] {notification.title}"
+            msg['Subject'] = f"[{_PRIORITY_LABEL[notification.priority]}] {notification.title}"
             msg['From'] = self.email_config.get('from_address', 'noreply@aiguardian.com')
             msg['To'] = preferences.email_address
             
@@ -178,21 +586,73 @@ class NotificationService:
             msg.attach(text_part)
             msg.attach(html_part)
             
-            # Send email
-            with smtplib.SMTP(self.email_config.get('smtp_host', 'smtp.gmail.com'), 
-                            self.email_config.get('smtp_port', 587)) as server:
-                server.starttls()
-                server.login(
-                    self.email_config.get('username'),
-                    self.email_config.get('password')
-                )
-                server.send_message(msg)
-            
-            return True
+            # Hand off to the flusher, which batches messages per SMTP session
+            return await self._enqueue_email(msg)
         except Exception as e:
             print(f"Email send error: {e}")
             return False
     
+    async def _enqueue_email(self, msg: 'MIMEMultipart') -> bool:
+        """Queue a message for the batched flusher and wait for the result"""
+        if self._email_flusher is None or self._email_flusher.done():
+            self._email_queue = asyncio.Queue()
+            self._email_flusher = asyncio.create_task(self._email_flush_loop())
+        
+        future = asyncio.get_running_loop().create_future()
+        self._email_queue.put_nowait((msg, future))
+        return await future
+    
+    async def _email_flush_loop(self):
+        """Drain queued emails in chunks and send each chunk over one session"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._email_queue.get()]
+            deadline = loop.time() + self.email_flush_interval
+            
+            while len(batch) < self.email_chunk_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._email_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self._send_email_batch(batch)
+            finally:
+                for _ in batch:
+                    self._email_queue.task_done()
+    
+    async def _send_email_batch(self, batch: List) -> None:
+        """Send queued messages; give up on the rest if too many fail"""
+        failed = 0
+        for sent, (msg, future) in enumerate(batch):
+            # Once a large batch sees >= 1/3 failures the server is likely
+            # rejecting us, so fail the remainder fast
+            if sent >= 30 and failed * 3 >= sent:
+                future.set_result(False)
+                continue
+            
+            try:
+                await self._deliver_email(msg)
+                future.set_result(True)
+            except Exception as e:
+                failed += 1
+                print(f"Email send error: {e}")
+                future.set_result(False)
+    
+    async def _deliver_email(self, msg: 'MIMEMultipart') -> None:
+        """Send over the pooled connection; reconnect once if it dropped"""
+        try:
+            smtp = await self._get_smtp()
+            await smtp.send_message(msg)
+        except aiosmtplib.SMTPServerDisconnected:
+            self._smtp = None
+            smtp = await self._get_smtp()
+            await smtp.send_message(msg)
+        self._smtp_sent += 1
+    
     async def _send_sms(self, notification: Notification, preferences: NotificationPreferences) -> bool:
         """Send SMS notification"""
         if not preferences.phone_number:
@@ -242,106 +702,57 @@ class NotificationService:
     
     async def _send_webhook(self, notification: Notification, preferences: NotificationPreferences) -> bool:
         """Send webhook notification"""
-        if not preferences.webhook_url:
+        if not preferences.webhook_url or not HTTPX_AVAILABLE:
             return False
         
-        # Placeholder for webhook
-        """
-        import httpx
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                preferences.webhook_url,
-                json=notification.to_dict(),
-                timeout=10.0
-            )
-            return response.status_code == 200
-        """
-        return True
+        response = await self._get_http().post(
+            preferences.webhook_url,
+            content=notification.to_json_bytes(),
+            headers={"content-type": "application/json"}
+        )
+        return response.status_code == 200
     
     async def _send_slack(self, notification: Notification, preferences: NotificationPreferences) -> bool:
-        """Send Slack notification"""
-        # Placeholder for Slack integration
-        """
-        from slack_sdk.webhook import WebhookClient
-        
-        webhook = WebhookClient(preferences.webhook_url)
-        
-        response = webhook.send(
-            text=notification.title,
-            blocks=[
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"*{notification.title}*\n{notification.message}"
+        """Send Slack notification via an incoming webhook"""
+        if not preferences.webhook_url or not HTTPX_AVAILABLE:
+            return False
+        
+        response = await self._get_http().post(
+            preferences.webhook_url,
+            json={
+                "text": notification.title,
+                "blocks": [
+                    {
+                        "type": "section",
+                        "text": {
+                            "type": "mrkdwn",
+                            "text": f"*{notification.title}*\n{notification.message}"
+                        }
                     }
-                }
-            ]
+                ]
+            }
         )
-        
         return response.status_code == 200
-        """
-        return True
     
     def _generate_email_html(self, notification: Notification) -> str:
         """Generate HTML email content"""
-        priority_colors = {
-            NotificationPriority.LOW: "#4CAF50",
-            NotificationPriority.MEDIUM: "#FF9800",
-            NotificationPriority.HIGH: "#FF5722",
-            NotificationPriority.URGENT: "#F44336"
-        }
-        
-        color = priority_colors.get(notification.priority, "#2196F3")
-        
-        return f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: {color}; color: white; padding: 20px; border-radius: 5px 5px 0 0; }}
-                .content {{ background: #f5f5f5; padding: 20px; }}
-                .footer {{ background: #333; color: white; padding: 10px; text-align: center; border-radius: 0 0 5px 5px; }}
-                .button {{ background: {color}; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h2>🛡️ AI Guardian Alert</h2>
-                    <p>{notification.title}</p>
-                </div>
-                <div class="content">
-                    <p><strong>Entity:</strong> {notification.entity_name}</p>
-                    <p><strong>Priority:</strong> {notification.priority.value.upper()}</p>
-                    <p>{notification.message}</p>
-                    <br>
-                    <a href="https://app.aiguardian.com/alerts/{notification.notification_id}" class="button">
-                        View Details
-                    </a>
-                </div>
-                <div class="footer">
-                    <p>AI Reputation & Identity Guardian</p>
-                    <p><small>Sent at {notification.created_at.strftime('%Y-%m-%d %H:%M:%S')}</small></p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        return _EMAIL_TEMPLATE.substitute(
+            color=_PRIORITY_COLORS.get(notification.priority, "#2196F3"),
+            title=escape(notification.title),
+            entity=escape(notification.entity_name),
+            priority=_PRIORITY_LABEL[notification.priority],
+            message=escape(notification.message),
+            nid=quote(notification.notification_id),
+            ts=notification.created_at.strftime('%Y-%m-%d %H:%M:%S')
+        )
     
     def _is_quiet_hours(self, preferences: NotificationPreferences) -> bool:
         """Check if current time is within quiet hours"""
         if preferences.quiet_hours_start is None or preferences.quiet_hours_end is None:
             return False
         
-        current_hour = datetime.now().hour
-        
-        if preferences.quiet_hours_start < preferences.quiet_hours_end:
-            return preferences.quiet_hours_start <= current_hour < preferences.quiet_hours_end
-        else:  # Quiet hours span midnight
-            return current_hour >= preferences.quiet_hours_start or current_hour < preferences.quiet_hours_end
+        mask = _quiet_mask(preferences.quiet_hours_start, preferences.quiet_hours_end)
+        return bool(mask >> time.localtime().tm_hour & 1)
     
     async def send_summary_report(
         self,
@@ -376,34 +787,63 @@ class NotificationService:
             created_at=datetime.now()
         )
         
-        # Get user preferences (placeholder - would fetch from database)
-        preferences = NotificationPreferences(
-            user_id=user_id,
-            enabled_channels=[NotificationChannel.EMAIL],
-            email_address="user@example.com"
-        )
+        preferences = await self._pref_loader.get(user_id)
+        if preferences is None:
+            return False
         
-        results = await self.send_notification(notification, preferences)
-        return results.get('email', False)
+        results = await self.send_notification(notification, preferences, coalesce=False)
+        # A coalesced notification is accepted and goes out with the window's summary
+        return bool(results.get('email') or results.get('coalesced'))
     
-    def _generate_report_summary(self, report_data: Dict) -> str:
-        """Generate summary text for report"""
-        return f"""
-        Summary for {report_data.get('entity_name')}:
-        
-        • Reputation Score: {report_data.get('reputation_score', 'N/A')}/100
-        • Total Mentions: {report_data.get('total_mentions', 0)}
-        • Sentiment: {report_data.get('average_sentiment', 'Neutral')}
-        • Trend: {report_data.get('trend_direction', 'Stable')}
+    async def _fetch_preferences(self, user_ids: List[str]) -> Dict[str, NotificationPreferences]:
+        """Load preferences for many users at once"""
+        # Placeholder - would run one query for the whole batch:
+        # SELECT * FROM notification_preferences WHERE user_id = ANY(:user_ids)
+        return {
+            user_id: NotificationPreferences(
+                user_id=user_id,
+                enabled_channels=[NotificationChannel.EMAIL],
+                email_address="user@example.com"
+            )
+            for user_id in user_ids
+        }
+    
+    async def send_summary_reports_bulk(
+        self,
+        rows: Iterable[Dict],
+        concurrency: Optional[int] = None
+    ) -> List:
+        """
+        Send many summary reports concurrently
         
-        View full report in your dashboard.
+        Args:
+            rows: Keyword arguments for send_summary_report, one dict per report
+            concurrency: Max reports in flight (default email 'concurrency', 16)
+            
+        Returns:
+            Per-row success status, or the exception raised for that row
         """
+        semaphore = asyncio.Semaphore(concurrency or self.email_config.get('concurrency', 16))
+        
+        async def send_one(row: Dict):
+            async with semaphore:
+                return await self.send_summary_report(**row)
+        
+        return await asyncio.gather(*(send_one(row) for row in rows), return_exceptions=True)
+    
+    def _generate_report_summary(self, report_data: Dict) -> str:
+        """Generate summary text for report"""
+        return _REPORT_SUMMARY_TEMPLATE.format(
+            entity_name=report_data.get('entity_name'),
+            reputation_score=report_data.get('reputation_score', 'N/A'),
+            total_mentions=report_data.get('total_mentions', 0),
+            average_sentiment=report_data.get('average_sentiment', 'Neutral'),
+            trend_direction=report_data.get('trend_direction', 'Stable')
+        )
 
 
 # Example usage
 if __name__ == "__main__":
-    import asyncio
-    
     async def test_notifications():
         # Initialize service
         service = NotificationService(config={
@@ -440,5 +880,7 @@ if __name__ == "__main__":
         # Send notification
         results = await service.send_notification(notification, preferences)
         print(f"Notification sent: {results}")
+        
+        await service.aclose()
     
     asyncio.run(test_notifications())
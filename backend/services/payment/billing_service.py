@@ -6,6 +6,57 @@ Only accessible by admin users
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
+import base64
+import hashlib
+import hmac
+import itertools
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Suffix that keeps IDs unique when several are issued in the same second
+_id_counter = itertools.count()
+
+
+def _load_payment_link_key() -> bytes:
+    """Key for payment link verifiers, from PAYMENT_LINK_SECRET"""
+    secret = os.getenv('PAYMENT_LINK_SECRET')
+    if secret:
+        key = secret.encode()
+        # BLAKE2b takes keys of at most 64 bytes; hash longer secrets down, never truncate
+        return key if len(key) <= 64 else hashlib.blake2b(key).digest()
+    
+    # A per-process key: links only verify in the worker that issued them
+    if os.getenv('ENVIRONMENT', 'development') not in ('development', 'test'):
+        logger.error(
+            "PAYMENT_LINK_SECRET is not set; payment links will fail verification "
+            "in other workers and after a restart"
+        )
+    return os.urandom(32)
+
+
+_PAYMENT_LINK_KEY = _load_payment_link_key()
+
+
+def _payment_link_mac(offer_id: str, user_email: str, token: str) -> str:
+    """Keyed 64-bit verifier for a payment link"""
+    return hashlib.blake2b(
+        f"{offer_id}{user_email}{token}".encode(),
+        digest_size=8,
+        key=_PAYMENT_LINK_KEY
+    ).hexdigest()
+
+
+def draw_tokens(n: int = 2, nbytes: int = 32) -> List[str]:
+    """Draw n URL-safe tokens from a single urandom read"""
+    buf = os.urandom(n * nbytes)
+    return [
+        base64.urlsafe_b64encode(buf[i * nbytes:(i + 1) * nbytes]).rstrip(b'=').decode()
+        for i in range(n)
+    ]
 
 
 class SubscriptionTier(str, Enum):
@@ -21,26 +72,29 @@ class BillingService:
     Admin-only functionality
     """
     
-    # Default pricing (can be overridden by admin)
-    DEFAULT_PRICING = {
-        SubscriptionTier.PROFESSIONAL: {
+    PAYMENT_URL_BASE = "https://secure.reputationguardian.com/payment/"
+    PORTAL_URL_BASE = "https://onboarding.reputationguardian.com/complete/"
+    
+    # Default pricing, read-only; admin overrides are applied per offer
+    DEFAULT_PRICING = MappingProxyType({
+        SubscriptionTier.PROFESSIONAL: MappingProxyType({
             "base_price": 997.00,
             "currency": "USD",
             "billing_cycle": "monthly",
-            "features": [
+            "features": (
                 "Personal brand protection",
                 "Unlimited monitoring",
                 "Instant threat alerts",
                 "Crisis detection",
                 "Monthly reports",
                 "24/7 surveillance"
-            ]
-        },
-        SubscriptionTier.ENTERPRISE: {
+            )
+        }),
+        SubscriptionTier.ENTERPRISE: MappingProxyType({
             "base_price": 4997.00,
             "currency": "USD",
             "billing_cycle": "monthly",
-            "features": [
+            "features": (
                 "Company-wide protection",
                 "Multiple executives/brands",
                 "Dedicated account manager",
@@ -49,26 +103,35 @@ class BillingService:
                 "PR team integration",
                 "Competitor tracking",
                 "White-glove service"
-            ]
-        },
-        SubscriptionTier.CUSTOM: {
+            )
+        }),
+        SubscriptionTier.CUSTOM: MappingProxyType({
             "base_price": None,  # Set by admin during onboarding
             "currency": "USD",
             "billing_cycle": "custom",
-            "features": ["Fully customized solution"]
-        }
-    }
+            "features": ("Fully customized solution",)
+        })
+    })
     
     @staticmethod
-    def get_subscription_pricing(tier: SubscriptionTier, custom_price: Optional[float] = None) -> Dict:
+    def get_subscription_pricing(tier: SubscriptionTier, custom_price: Optional[float] = None) -> MappingProxyType:
         """
         Get pricing for a subscription tier
         Admin can set custom pricing during onboarding
+        
+        Returns a read-only view shared between callers
         """
-        pricing = BillingService.DEFAULT_PRICING.get(tier)
+        if tier != SubscriptionTier.CUSTOM:
+            custom_price = None
+        return BillingService._pricing_cached(tier, custom_price or None)
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _pricing_cached(tier: SubscriptionTier, custom_price: Optional[float]) -> MappingProxyType:
+        pricing = BillingService.DEFAULT_PRICING[tier]
         
-        if tier == SubscriptionTier.CUSTOM and custom_price:
-            pricing["base_price"] = custom_price
+        if custom_price:
+            return MappingProxyType({**pricing, "base_price": custom_price})
             
         return pricing
     
@@ -107,12 +170,13 @@ class BillingService:
         final_price = base_price - discount_amount
         
         # Merge features
-        features = pricing["features"].copy()
+        features = pricing["features"]
         if custom_features:
-            features.extend(custom_features)
+            features = (*features, *custom_features)
         
+        now = datetime.now()
         offer = {
-            "offer_id": f"OFFER-{user_id}-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+            "offer_id": f"OFFER-{user_id}-{now:%Y%m%d%H%M%S}-{next(_id_counter)}",
             "user_id": user_id,
             "tier": tier.value,
             "base_price": base_price,
@@ -122,8 +186,8 @@ class BillingService:
             "currency": pricing["currency"],
             "billing_cycle": pricing["billing_cycle"],
             "features": features,
-            "created_at": datetime.now().isoformat(),
-            "expires_at": (datetime.now() + timedelta(days=7)).isoformat(),
+            "created_at": now.isoformat(),
+            "expires_at": (now + timedelta(days=7)).isoformat(),
             "admin_notes": notes,
             "status": "pending"
         }
@@ -131,7 +195,11 @@ class BillingService:
         return offer
     
     @staticmethod
-    def generate_secure_payment_link(offer_id: str, user_email: str) -> str:
+    def generate_secure_payment_link(
+        offer_id: str,
+        user_email: str,
+        token: Optional[str] = None
+    ) -> str:
         """
         Generate a secure payment collection link
         This link is sent to the user during onboarding
@@ -144,29 +212,33 @@ class BillingService:
         # In production, integrate with payment processor
         # For now, return a placeholder secure link
         
-        import hashlib
-        import secrets
-        
-        # Generate secure token
-        token = secrets.token_urlsafe(32)
+        # Generate secure token unless one was drawn with draw_tokens()
+        if token is None:
+            token = draw_tokens(1)[0]
         
-        # Create hash for verification
-        verification_hash = hashlib.sha256(
-            f"{offer_id}{user_email}{token}".encode()
-        ).hexdigest()[:16]
+        # Keyed hash for verification, so the link can't be forged from the token
+        verification_hash = _payment_link_mac(offer_id, user_email, token)
         
         # Construct secure payment URL
-        payment_url = f"https://secure.reputationguardian.com/payment/{offer_id}?token={token}&verify={verification_hash}"
+        payment_url = f"{BillingService.PAYMENT_URL_BASE}{offer_id}?token={token}&verify={verification_hash}"
         
         return payment_url
     
+    @staticmethod
+    def verify_payment_link(offer_id: str, user_email: str, token: str, verify: str) -> bool:
+        """Check the verify parameter of a payment link"""
+        # Compare bytes: compare_digest raises TypeError on non-ASCII str input
+        expected = _payment_link_mac(offer_id, user_email, token).encode()
+        return hmac.compare_digest(expected, str(verify).encode())
+    
     @staticmethod
     def generate_onboarding_portal_link(
         user_id: int,
         offer_id: str,
         include_document_upload: bool = True,
         include_video_upload: bool = True,
-        include_photo_upload: bool = True
+        include_photo_upload: bool = True,
+        token: Optional[str] = None
     ) -> str:
         """
         Generate secure onboarding portal link
@@ -183,13 +255,13 @@ class BillingService:
             include_document_upload: Allow document uploads
             include_video_upload: Allow video uploads
             include_photo_upload: Allow photo uploads
+            token: Pre-drawn token (see draw_tokens)
             
         Returns:
             Secure onboarding portal URL
         """
-        import secrets
-        
-        token = secrets.token_urlsafe(32)
+        if token is None:
+            token = draw_tokens(1)[0]
         
         # Build portal URL with features
         features = []
@@ -201,7 +273,7 @@ class BillingService:
             features.append("photos")
         
         portal_url = (
-            f"https://onboarding.reputationguardian.com/complete/{user_id}?"
+            f"{BillingService.PORTAL_URL_BASE}{user_id}?"
             f"offer={offer_id}&token={token}&features={','.join(features)}"
         )
         
@@ -226,15 +298,17 @@ class BillingService:
         Returns:
             Subscription details
         """
+        now = datetime.now()
+        started_at = now.isoformat()
         subscription = {
-            "subscription_id": f"SUB-{user_id}-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+            "subscription_id": f"SUB-{user_id}-{now:%Y%m%d%H%M%S}-{next(_id_counter)}",
             "user_id": user_id,
             "offer_id": offer_id,
             "payment_method_id": payment_method_id,
             "status": "active",
-            "started_at": datetime.now().isoformat(),
-            "current_period_start": datetime.now().isoformat(),
-            "current_period_end": (datetime.now() + timedelta(days=30)).isoformat(),
+            "started_at": started_at,
+            "current_period_start": started_at,
+            "current_period_end": (now + timedelta(days=30)).isoformat(),
             "billing_details": billing_details,
             "auto_renew": True
         }
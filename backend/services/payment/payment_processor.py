@@ -5,6 +5,15 @@ Integrates with payment gateways (Stripe, PayPal, etc.)
 
 from typing import Dict, Optional
 from datetime import datetime
+import itertools
+import time
+
+# Suffix that keeps IDs unique even within one clock tick
+_id_counter = itertools.count()
+
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}_{time.time_ns()}_{next(_id_counter)}"
 
 
 class PaymentProcessor:
@@ -32,11 +41,11 @@ class PaymentProcessor:
         )
         """
         return {
-            "payment_intent_id": f"pi_{datetime.now().timestamp()}",
+            "payment_intent_id": _new_id("pi"),
             "amount": amount,
             "currency": currency,
             "status": "requires_payment_method",
-            "client_secret": f"secret_{datetime.now().timestamp()}",
+            "client_secret": _new_id("secret"),
             "customer_email": customer_email,
             "metadata": metadata or {}
         }
@@ -54,9 +63,9 @@ class PaymentProcessor:
         )
         """
         return {
-            "setup_intent_id": f"seti_{datetime.now().timestamp()}",
+            "setup_intent_id": _new_id("seti"),
             "status": "requires_payment_method",
-            "client_secret": f"secret_setup_{datetime.now().timestamp()}",
+            "client_secret": _new_id("secret_setup"),
             "customer_email": customer_email
         }
     
@@ -99,13 +108,14 @@ class PaymentProcessor:
             trial_period_days=trial_period_days
         )
         """
+        now = datetime.now().isoformat()
         return {
-            "subscription_id": f"sub_{datetime.now().timestamp()}",
+            "subscription_id": _new_id("sub"),
             "customer_id": customer_id,
             "payment_method_id": payment_method_id,
             "status": "active",
-            "current_period_start": datetime.now().isoformat(),
-            "trial_end": None if trial_period_days == 0 else datetime.now().isoformat()
+            "current_period_start": now,
+            "trial_end": None if trial_period_days == 0 else now
         }
     
     @staticmethod
@@ -128,7 +138,7 @@ class PaymentProcessor:
         )
         """
         return {
-            "payment_id": f"pay_{datetime.now().timestamp()}",
+            "payment_id": _new_id("pay"),
             "amount": amount,
             "currency": currency,
             "status": "succeeded",
@@ -157,7 +167,7 @@ class PaymentProcessor:
         )
         """
         return {
-            "refund_id": f"ref_{datetime.now().timestamp()}",
+            "refund_id": _new_id("ref"),
             "payment_id": payment_id,
             "amount": amount,
             "status": "succeeded",
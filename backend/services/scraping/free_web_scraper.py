@@ -7,15 +7,166 @@ Cost: $0/month for code, $50-100/month for proxies (optional)
 
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
-from dataclasses import dataclass
-from typing import List, Dict, Optional
-from datetime import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, List, Dict, Optional, Union
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import quote_plus, urlparse
+import io
 import re
+import time
+import random
 import hashlib
+import zlib
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# selectolax's Lexbor parser runs in C; fall back to BeautifulSoup if missing
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    from bs4 import BeautifulSoup, SoupStrainer
+    SELECTOLAX_AVAILABLE = False
+
+# lxml streams RSS items (feedparser is the fallback) and, without
+# selectolax, extracts tweets with compiled XPath instead of BeautifulSoup
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# MinHash-LSH for near-duplicate suppression; exact-hash dedup without it
+try:
+    from datasketch import MinHash, MinHashLSH
+    DATASKETCH_AVAILABLE = True
+except ImportError:
+    DATASKETCH_AVAILABLE = False
+
+# Aho-Corasick matches all keywords in one pass over the text
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# aiosqlite backs the persistent seen-items cache across sweeps
+try:
+    import aiosqlite
+    AIOSQLITE_AVAILABLE = True
+except ImportError:
+    AIOSQLITE_AVAILABLE = False
+
+# xxh3 is the fastest dedup hash; blake2b is the stdlib fallback
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+
+# Retry policy for rate-limited / flaky hosts
+FETCH_ATTEMPTS = 4
+FETCH_MAX_DELAY = 30.0
+PER_HOST_CONCURRENCY = 4
+
+# Near-duplicate detection: word 5-gram shingles, Jaccard >= 0.85
+SHINGLE_SIZE = 5
+MINHASH_PERMUTATIONS = 64
+NEAR_DUPLICATE_THRESHOLD = 0.85
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Default threat terms, matched as whole words in one regex pass
+THREAT_RE = re.compile(r'\b(?:scam|fraud|fake|deepfake|lies)\b', re.IGNORECASE)
+
+# Direct image links, tested case-insensitively on the raw URL
+IMG_EXT_RE = re.compile(r'\.(?:jpe?g|png|gif|webp)(?:\?|$)', re.IGNORECASE)
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching one whole class token"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+if LXML_AVAILABLE:
+    TWEETS_XP = etree.XPath(f"//div[{_has_class('timeline-item')}]")
+    CONTENT_XP = etree.XPath(f".//div[{_has_class('tweet-content')}]")
+    AUTHOR_XP = etree.XPath(f"(.//a[{_has_class('username')}])[1]//text()")
+    LINK_XP = etree.XPath(f"(.//a[{_has_class('tweet-link')}])[1]/@href")
+    IMAGES_XP = etree.XPath(f".//div[{_has_class('attachments')}]//img/@src")
+    LIKES_XP = etree.XPath(
+        f"(.//div[{_has_class('tweet-stats')}]//span[{_has_class('icon-heart')}])[1]/..//text()"
+    )
+    # Byte input is decoded as UTF-8 rather than sniffed
+    _UTF8_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+
+def _joined_text(texts: List[str]) -> str:
+    """Concatenate text nodes the way .text(strip=True) does"""
+    return ''.join(t.strip() for t in texts)
+
+
+def _shingles(text_lower: str) -> set:
+    """Word n-gram shingles of already-lowercased text"""
+    tokens = _TOKEN_RE.findall(text_lower)
+    if len(tokens) <= SHINGLE_SIZE:
+        return {' '.join(tokens)} if tokens else set()
+    return {
+        ' '.join(tokens[i:i + SHINGLE_SIZE])
+        for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+
+class KeywordMatcher:
+    """Case-insensitive 'contains any keyword' test, built once per keyword set"""
+    
+    def __init__(self, keywords: List[str]):
+        self.keywords = [kw.lower() for kw in keywords if kw]
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE and self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for kw in self.keywords:
+                self._automaton.add_word(kw, kw)
+            self._automaton.make_automaton()
+    
+    def matches_lower(self, text_lower: str) -> bool:
+        """Match against text that is already lowercased"""
+        if self._automaton is not None:
+            return next(self._automaton.iter(text_lower), None) is not None
+        return any(kw in text_lower for kw in self.keywords)
+    
+    def matches(self, text: str) -> bool:
+        return self.matches_lower(text.lower())
+
+
+@lru_cache(maxsize=8192)
+def _hash_content_cached(content: str, secure: bool) -> str:
+    """Memoized content hash; titles and reposted text recur within a sweep"""
+    data = content.encode('utf-8', 'ignore')
+    if secure:
+        return hashlib.sha256(data).hexdigest()[:16]
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP-dates are ignored)"""
+    if not value:
+        return None
+    try:
+        return min(max(float(value), 0.0), FETCH_MAX_DELAY)
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True)
 class ScrapedContent:
     """Represents scraped public content"""
     source: str  # twitter, instagram, reddit, news
@@ -26,6 +177,11 @@ class ScrapedContent:
     images: List[str]
     engagement: Dict[str, int]  # likes, shares, comments
     content_hash: str
+    # Lowercased content, computed once for keyword/threat matching and dedup
+    content_lower: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.content_lower = self.content.lower()
     
     
 class PublicContentScraper:
@@ -42,24 +198,128 @@ class PublicContentScraper:
     
     def __init__(self, proxies: Optional[List[str]] = None):
         self.proxies = proxies or []
-        self.proxy_index = 0
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
             'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
         ]
+        self._default_headers = {'User-Agent': self.user_agents[0]}
+        # Max concurrent per-keyword fetches within one news sweep
+        self.fetch_concurrency = 16
+        # One pooled session for every scraper and host (created lazily)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._host_semaphores: Dict[str, asyncio.BoundedSemaphore] = {}
+        self._keyword_matchers: Dict[tuple, KeywordMatcher] = {}
+        # Threads for blocking client libraries (PRAW, Instaloader)
+        self.blocking_workers = 8
+        self._pool: Optional[ThreadPoolExecutor] = None
+    
+    async def session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=8,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True
+                ),
+                headers=self._default_headers
+            )
+        return self._session
+    
+    def keyword_matcher(self, keywords: List[str]) -> KeywordMatcher:
+        """Matcher for a keyword set, reused across calls with the same set"""
+        key = tuple(keywords)
+        matcher = self._keyword_matchers.get(key)
+        if matcher is None:
+            matcher = self._keyword_matchers[key] = KeywordMatcher(keywords)
+        return matcher
+    
+    def _semaphore_for(self, host: str) -> asyncio.BoundedSemaphore:
+        """Per-host limit on in-flight requests"""
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.BoundedSemaphore(PER_HOST_CONCURRENCY)
+        return semaphore
+    
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        as_json: bool = False,
+        as_bytes: bool = False,
+        **kwargs
+    ) -> Optional[Any]:
+        """
+        GET a URL under its host's semaphore, retrying connection errors,
+        429 and 5xx with jittered exponential backoff (or Retry-After)
+        
+        Returns the body (text, bytes or parsed JSON), or None for other statuses
+        """
+        semaphore = self._semaphore_for(urlparse(url).netloc)
+        
+        for attempt in range(FETCH_ATTEMPTS):
+            delay = None
+            try:
+                async with semaphore, session.get(url, **kwargs) as response:
+                    if response.status == 200:
+                        if as_bytes:
+                            return await response.read()
+                        return await (response.json() if as_json else response.text())
+                    if response.status != 429 and response.status < 500:
+                        return None
+                    delay = _retry_after(response.headers.get('Retry-After'))
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == FETCH_ATTEMPTS - 1:
+                    raise
+            
+            if attempt < FETCH_ATTEMPTS - 1:
+                if delay is None:
+                    delay = min(2 ** attempt + random.random(), FETCH_MAX_DELAY)
+                await asyncio.sleep(delay)
+        
+        return None
     
-    def _get_next_proxy(self) -> Optional[str]:
-        """Rotate through proxies to avoid rate limits"""
+    async def _run_blocking(self, func, *args):
+        """Run a blocking call on the scraper's thread pool"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.blocking_workers,
+                thread_name_prefix='scraper'
+            )
+        return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+    
+    async def close(self):
+        """Close the shared HTTP session and thread pool"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+    
+    def _get_proxy_for(self, url: str) -> Optional[str]:
+        """
+        Pick the proxy for a URL's host
+        
+        Hosts map to a fixed proxy so repeat requests reuse the pooled
+        keep-alive connection; different hosts still spread across proxies
+        """
         if not self.proxies:
             return None
-        proxy = self.proxies[self.proxy_index]
-        self.proxy_index = (self.proxy_index + 1) % len(self.proxies)
-        return proxy
+        host = urlparse(url).netloc
+        return self.proxies[zlib.crc32(host.encode()) % len(self.proxies)]
     
-    def _hash_content(self, content: str) -> str:
-        """Create unique hash for deduplication"""
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+    def _hash_content(self, content: str, secure: bool = False) -> str:
+        """
+        Create a 16-hex-char hash for in-process deduplication
+        
+        Pass secure=True for a SHA-256 prefix when the key must resist
+        deliberate collisions (e.g. shared across processes)
+        """
+        return _hash_content_cached(content, secure)
     
     async def scrape_twitter_nitter(
         self, 
@@ -83,74 +343,172 @@ class PublicContentScraper:
             'https://nitter.unixfox.eu'
         ]
         
-        async with aiohttp.ClientSession() as session:
-            for instance in nitter_instances:
-                try:
-                    # Search for keywords mentioning username
-                    search_query = f'{username} {" OR ".join(keywords)}'
-                    url = f'{instance}/search?q={search_query}'
-                    
-                    headers = {'User-Agent': self.user_agents[0]}
-                    proxy = self._get_next_proxy()
-                    
-                    async with session.get(
-                        url, 
-                        headers=headers,
-                        proxy=proxy,
-                        timeout=10
-                    ) as response:
-                        if response.status == 200:
-                            html = await response.text()
-                            soup = BeautifulSoup(html, 'html.parser')
-                            
-                            # Parse tweets
-                            tweets = soup.find_all('div', class_='timeline-item')
-                            for tweet in tweets:
-                                content_div = tweet.find('div', class_='tweet-content')
-                                if not content_div:
-                                    continue
-                                
-                                content_text = content_div.get_text(strip=True)
-                                
-                                # Extract metadata
-                                author_elem = tweet.find('a', class_='username')
-                                author = author_elem.get_text(strip=True) if author_elem else 'Unknown'
-                                
-                                tweet_link = tweet.find('a', class_='tweet-link')
-                                tweet_url = f"{instance}{tweet_link['href']}" if tweet_link else url
-                                
-                                # Extract images
-                                images = []
-                                img_divs = tweet.find_all('div', class_='attachments')
-                                for img_div in img_divs:
-                                    img_tags = img_div.find_all('img')
-                                    images.extend([img['src'] for img in img_tags if 'src' in img.attrs])
-                                
-                                # Extract engagement (if available)
-                                stats_div = tweet.find('div', class_='tweet-stats')
-                                engagement = {'likes': 0, 'retweets': 0, 'replies': 0}
-                                if stats_div:
-                                    likes_elem = stats_div.find('span', class_='icon-heart')
-                                    if likes_elem:
-                                        likes_text = likes_elem.parent.get_text(strip=True)
-                                        engagement['likes'] = self._parse_number(likes_text)
-                                
-                                results.append(ScrapedContent(
-                                    source='twitter',
-                                    url=tweet_url,
-                                    author=author,
-                                    content=content_text,
-                                    timestamp=datetime.now(),  # Parse from HTML in production
-                                    images=images,
-                                    engagement=engagement,
-                                    content_hash=self._hash_content(content_text)
-                                ))
-                            
-                            break  # Success, no need to try other instances
+        # Search for keywords mentioning username, encoded once for all instances
+        search_query = quote_plus(f'{username} {" OR ".join(keywords)}')
+        
+        session = await self.session()
+        for instance in nitter_instances:
+            try:
+                url = f'{instance}/search?q={search_query}'
+                proxy = self._get_proxy_for(url)
                 
-                except Exception as e:
-                    print(f"Nitter instance {instance} failed: {e}")
-                    continue
+                html = await self._fetch(
+                    session,
+                    url,
+                    as_bytes=True,
+                    headers=self._default_headers,
+                    proxy=proxy,
+                    timeout=10
+                )
+                if html is not None:
+                    results.extend(self._parse_nitter_html(html, instance, url))
+                    break  # Success, no need to try other instances
+            
+            except Exception as e:
+                logger.warning("Nitter instance %s failed: %s", instance, e)
+                continue
+        
+        return results
+    
+    def _parse_nitter_html(self, html: Union[str, bytes], instance: str, page_url: str) -> List[ScrapedContent]:
+        """
+        Extract tweets from a Nitter search results page
+        
+        Takes the raw response bytes so the page is never decoded into a
+        separate str copy; Nitter serves UTF-8
+        """
+        if not SELECTOLAX_AVAILABLE:
+            if LXML_AVAILABLE:
+                return self._parse_nitter_html_lxml(html, instance, page_url)
+            return self._parse_nitter_html_bs4(html, instance, page_url)
+        
+        results = []
+        tree = LexborHTMLParser(html)
+        
+        for tweet in tree.css('div.timeline-item'):
+            content_div = tweet.css_first('div.tweet-content')
+            if content_div is None:
+                continue
+            
+            content_text = content_div.text(strip=True)
+            
+            # Extract metadata
+            author_elem = tweet.css_first('a.username')
+            author = author_elem.text(strip=True) if author_elem is not None else 'Unknown'
+            
+            tweet_link = tweet.css_first('a.tweet-link')
+            href = tweet_link.attributes.get('href') if tweet_link is not None else None
+            tweet_url = f"{instance}{href}" if href else page_url
+            
+            # Extract images
+            images = [
+                img.attributes['src'] for img in tweet.css('div.attachments img')
+                if img.attributes.get('src')
+            ]
+            
+            # Extract engagement (if available)
+            engagement = {'likes': 0, 'retweets': 0, 'replies': 0}
+            likes_elem = tweet.css_first('div.tweet-stats span.icon-heart')
+            if likes_elem is not None:
+                engagement['likes'] = self._parse_number(likes_elem.parent.text(strip=True))
+            
+            results.append(ScrapedContent(
+                source='twitter',
+                url=tweet_url,
+                author=author,
+                content=content_text,
+                timestamp=datetime.now(),  # Parse from HTML in production
+                images=images,
+                engagement=engagement,
+                content_hash=self._hash_content(content_text)
+            ))
+        
+        return results
+    
+    def _parse_nitter_html_lxml(self, html: Union[str, bytes], instance: str, page_url: str) -> List[ScrapedContent]:
+        """lxml version of _parse_nitter_html, using module-level compiled XPaths"""
+        results = []
+        try:
+            root = lxml_html.fromstring(html, parser=_UTF8_HTML_PARSER)
+        except etree.ParserError:
+            return results
+        
+        for tweet in TWEETS_XP(root):
+            content_divs = CONTENT_XP(tweet)
+            if not content_divs:
+                continue
+            
+            content_text = _joined_text(content_divs[0].xpath('.//text()'))
+            author = _joined_text(AUTHOR_XP(tweet)) or 'Unknown'
+            
+            href = LINK_XP(tweet)
+            tweet_url = f"{instance}{href[0]}" if href and href[0] else page_url
+            
+            images = [src for src in IMAGES_XP(tweet) if src]
+            
+            engagement = {'likes': 0, 'retweets': 0, 'replies': 0}
+            likes_text = LIKES_XP(tweet)
+            if likes_text:
+                engagement['likes'] = self._parse_number(_joined_text(likes_text))
+            
+            results.append(ScrapedContent(
+                source='twitter',
+                url=tweet_url,
+                author=author,
+                content=content_text,
+                timestamp=datetime.now(),  # Parse from HTML in production
+                images=images,
+                engagement=engagement,
+                content_hash=self._hash_content(content_text)
+            ))
+        
+        return results
+    
+    def _parse_nitter_html_bs4(self, html: Union[str, bytes], instance: str, page_url: str) -> List[ScrapedContent]:
+        """BeautifulSoup version of _parse_nitter_html"""
+        results = []
+        # Only build the timeline-item subtrees, with lxml's parser if present
+        soup = BeautifulSoup(
+            html,
+            'lxml' if LXML_AVAILABLE else 'html.parser',
+            parse_only=SoupStrainer('div', class_='timeline-item'),
+            from_encoding='utf-8' if isinstance(html, bytes) else None
+        )
+        
+        for tweet in soup.find_all('div', class_='timeline-item', recursive=False):
+            content_div = tweet.find('div', class_='tweet-content')
+            if not content_div:
+                continue
+            
+            content_text = content_div.get_text(strip=True)
+            
+            author_elem = tweet.find('a', class_='username')
+            author = author_elem.get_text(strip=True) if author_elem else 'Unknown'
+            
+            tweet_link = tweet.find('a', class_='tweet-link')
+            tweet_url = f"{instance}{tweet_link['href']}" if tweet_link else page_url
+            
+            images = []
+            for img_div in tweet.find_all('div', class_='attachments'):
+                images.extend([img['src'] for img in img_div.find_all('img') if 'src' in img.attrs])
+            
+            stats_div = tweet.find('div', class_='tweet-stats')
+            engagement = {'likes': 0, 'retweets': 0, 'replies': 0}
+            if stats_div:
+                likes_elem = stats_div.find('span', class_='icon-heart')
+                if likes_elem:
+                    engagement['likes'] = self._parse_number(likes_elem.parent.get_text(strip=True))
+            
+            results.append(ScrapedContent(
+                source='twitter',
+                url=tweet_url,
+                author=author,
+                content=content_text,
+                timestamp=datetime.now(),  # Parse from HTML in production
+                images=images,
+                engagement=engagement,
+                content_hash=self._hash_content(content_text)
+            ))
         
         return results
     
@@ -166,9 +524,23 @@ class PublicContentScraper:
         PRAW free tier: 60 requests/minute
         Cost: $0
         """
+        # PRAW is synchronous; keep it off the event loop
+        return await self._run_blocking(
+            self._scrape_reddit_praw_sync, subreddits, keywords, time_filter
+        )
+    
+    def _scrape_reddit_praw_sync(
+        self,
+        subreddits: List[str],
+        keywords: List[str],
+        time_filter: str
+    ) -> List[ScrapedContent]:
         import praw  # pip install praw
+        from praw.models import MoreComments
         
         results = []
+        matcher = self.keyword_matcher(keywords)
+        query = ' OR '.join(keywords)
         
         # Free Reddit API credentials (create at reddit.com/prefs/apps)
         reddit = praw.Reddit(
@@ -182,7 +554,6 @@ class PublicContentScraper:
                 subreddit = reddit.subreddit(subreddit_name)
                 
                 # Search for keywords
-                query = ' OR '.join(keywords)
                 for submission in subreddit.search(query, time_filter=time_filter, limit=100):
                     results.append(ScrapedContent(
                         source='reddit',
@@ -198,10 +569,18 @@ class PublicContentScraper:
                         content_hash=self._hash_content(submission.title + submission.selftext)
                     ))
                     
-                    # Also check comments
-                    submission.comments.replace_more(limit=5)
-                    for comment in submission.comments.list()[:50]:
-                        if any(kw.lower() in comment.body.lower() for kw in keywords):
+                    # Also check comments; skip the comment fetch when there are none
+                    if not submission.num_comments:
+                        continue
+                    comments = submission.comments.list()
+                    # Only expand "load more" stubs when the forest has any
+                    if any(isinstance(c, MoreComments) for c in comments):
+                        submission.comments.replace_more(limit=5)
+                        comments = submission.comments.list()
+                    for comment in comments[:50]:
+                        if isinstance(comment, MoreComments):
+                            continue
+                        if matcher.matches(comment.body):
                             results.append(ScrapedContent(
                                 source='reddit',
                                 url=f'https://reddit.com{comment.permalink}',
@@ -216,7 +595,7 @@ class PublicContentScraper:
                             ))
             
             except Exception as e:
-                print(f"Reddit scraping error for r/{subreddit_name}: {e}")
+                logger.warning("Reddit scraping error for r/%s: %s", subreddit_name, e)
                 continue
         
         return results
@@ -231,6 +610,10 @@ class PublicContentScraper:
         Only public posts, no login required
         Cost: $0
         """
+        # Instaloader is synchronous; keep it off the event loop
+        return await self._run_blocking(self._scrape_instagram_public_sync, username)
+    
+    def _scrape_instagram_public_sync(self, username: str) -> List[ScrapedContent]:
         from instaloader import Instaloader, Profile  # pip install instaloader
         
         results = []
@@ -265,7 +648,7 @@ class PublicContentScraper:
                     break
         
         except Exception as e:
-            print(f"Instagram scraping error for @{username}: {e}")
+            logger.warning("Instagram scraping error for @%s: %s", username, e)
         
         return results
     
@@ -284,31 +667,86 @@ class PublicContentScraper:
         
         Cost: $0
         """
-        import feedparser  # pip install feedparser
+        semaphore = asyncio.Semaphore(self.fetch_concurrency)
+        batches = await asyncio.gather(
+            *(self._fetch_google_news(keyword, semaphore) for keyword in keywords),
+            return_exceptions=True
+        )
+        return [item for batch in batches if isinstance(batch, list) for item in batch]
+    
+    async def _fetch_google_news(self, keyword: str, semaphore: asyncio.Semaphore) -> List[ScrapedContent]:
+        """Google News RSS results for one keyword (FREE, unlimited)"""
+        google_news_url = f'https://news.google.com/rss/search?q={quote_plus(keyword)}'
         
+        try:
+            if LXML_AVAILABLE:
+                session = await self.session()
+                async with semaphore:
+                    data = await self._fetch(session, google_news_url, as_bytes=True)
+                if data is None:
+                    return []
+                return await self._run_blocking(self._parse_rss_items, data, 20)
+            
+            import feedparser  # pip install feedparser
+            
+            # feedparser blocks, so run it off the event loop
+            async with semaphore:
+                feed = await asyncio.get_running_loop().run_in_executor(
+                    None, feedparser.parse, google_news_url
+                )
+            
+            return [
+                ScrapedContent(
+                    source='google_news',
+                    url=entry.link,
+                    author=entry.get('source', {}).get('title', 'Unknown'),
+                    content=f"{entry.title}\n\n{entry.get('summary', '')}",
+                    timestamp=datetime(*entry.published_parsed[:6]) if hasattr(entry, 'published_parsed') else datetime.now(),
+                    images=[],
+                    engagement={},
+                    content_hash=self._hash_content(entry.title)
+                )
+                for entry in feed.entries[:20]  # Limit per keyword
+            ]
+        
+        except Exception as e:
+            logger.warning("Google News RSS error for '%s': %s", keyword, e)
+            return []
+    
+    def _parse_rss_items(self, data: bytes, limit: int) -> List[ScrapedContent]:
+        """Stream <item> elements out of an RSS document"""
         results = []
+        items = etree.iterparse(
+            io.BytesIO(data),
+            events=('end',),
+            tag='item',
+            resolve_entities=False,
+            no_network=True
+        )
         
-        # Google News RSS (FREE, unlimited)
-        for keyword in keywords:
-            google_news_url = f'https://news.google.com/rss/search?q={keyword}'
-            
+        for _, item in items:
+            title = item.findtext('title') or ''
+            published = item.findtext('pubDate')
             try:
-                feed = feedparser.parse(google_news_url)
-                
-                for entry in feed.entries[:20]:  # Limit per keyword
-                    results.append(ScrapedContent(
-                        source='google_news',
-                        url=entry.link,
-                        author=entry.get('source', {}).get('title', 'Unknown'),
-                        content=f"{entry.title}\n\n{entry.get('summary', '')}",
-                        timestamp=datetime(*entry.published_parsed[:6]) if hasattr(entry, 'published_parsed') else datetime.now(),
-                        images=[],
-                        engagement={},
-                        content_hash=self._hash_content(entry.title)
-                    ))
+                # Naive UTC, matching feedparser's published_parsed
+                timestamp = parsedate_to_datetime(published).astimezone(timezone.utc).replace(tzinfo=None)
+            except (TypeError, ValueError):
+                timestamp = datetime.now()
             
-            except Exception as e:
-                print(f"Google News RSS error for '{keyword}': {e}")
+            results.append(ScrapedContent(
+                source='google_news',
+                url=item.findtext('link') or '',
+                author=item.findtext('source') or 'Unknown',
+                content=f"{title}\n\n{item.findtext('description') or ''}",
+                timestamp=timestamp,
+                images=[],
+                engagement={},
+                content_hash=self._hash_content(title)
+            ))
+            item.clear()
+            
+            if len(results) >= limit:
+                break
         
         return results
     
@@ -322,34 +760,45 @@ class PublicContentScraper:
         Free tier: 100 requests/day (3,000/month)
         Cost: $0
         """
+        session = await self.session()
+        semaphore = asyncio.Semaphore(self.fetch_concurrency)
+        batches = await asyncio.gather(
+            *(self._fetch_newsapi(session, keyword, semaphore) for keyword in keywords),
+            return_exceptions=True
+        )
+        return [item for batch in batches if isinstance(batch, list) for item in batch]
+    
+    async def _fetch_newsapi(
+        self,
+        session: aiohttp.ClientSession,
+        keyword: str,
+        semaphore: asyncio.Semaphore
+    ) -> List[ScrapedContent]:
+        """NewsAPI results for one keyword"""
         results = []
         
         # NewsAPI.org free API key (get from newsapi.org)
         API_KEY = 'YOUR_FREE_API_KEY'
+        url = f'https://newsapi.org/v2/everything?q={quote_plus(keyword)}&apiKey={API_KEY}&pageSize=20'
         
-        async with aiohttp.ClientSession() as session:
-            for keyword in keywords:
-                url = f'https://newsapi.org/v2/everything?q={keyword}&apiKey={API_KEY}&pageSize=20'
-                
-                try:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            
-                            for article in data.get('articles', []):
-                                results.append(ScrapedContent(
-                                    source='newsapi',
-                                    url=article['url'],
-                                    author=article.get('author', 'Unknown'),
-                                    content=f"{article['title']}\n\n{article.get('description', '')}",
-                                    timestamp=datetime.fromisoformat(article['publishedAt'].replace('Z', '+00:00')),
-                                    images=[article['urlToImage']] if article.get('urlToImage') else [],
-                                    engagement={},
-                                    content_hash=self._hash_content(article['title'])
-                                ))
-                
-                except Exception as e:
-                    print(f"NewsAPI error for '{keyword}': {e}")
+        try:
+            async with semaphore:
+                data = await self._fetch(session, url, as_json=True)
+            
+            for article in (data or {}).get('articles', []):
+                results.append(ScrapedContent(
+                    source='newsapi',
+                    url=article['url'],
+                    author=article.get('author', 'Unknown'),
+                    content=f"{article['title']}\n\n{article.get('description', '')}",
+                    timestamp=datetime.fromisoformat(article['publishedAt'].replace('Z', '+00:00')),
+                    images=[article['urlToImage']] if article.get('urlToImage') else [],
+                    engagement={},
+                    content_hash=self._hash_content(article['title'])
+                ))
+        
+        except Exception as e:
+            logger.warning("NewsAPI error for '%s': %s", keyword, e)
         
         return results
     
@@ -390,37 +839,33 @@ class PublicContentScraper:
                     ))
         
         except Exception as e:
-            print(f"TikTok scraping error for @{username}: {e}")
+            logger.warning("TikTok scraping error for @%s: %s", username, e)
         
         return results
     
+    # Engagement count suffixes, looked up by the last character
+    _MULT = {'K': 1000, 'M': 1000000, 'B': 1000000000}
+    
     def _parse_number(self, text: str) -> int:
         """Parse engagement numbers (e.g., '1.2K' -> 1200)"""
         text = text.strip().upper()
-        multipliers = {'K': 1000, 'M': 1000000, 'B': 1000000000}
-        
-        for suffix, multiplier in multipliers.items():
-            if suffix in text:
-                try:
-                    num = float(text.replace(suffix, '').strip())
-                    return int(num * multiplier)
-                except:
-                    pass
+        if not text:
+            return 0
         
+        multiplier = self._MULT.get(text[-1], 1)
+        body = text[:-1] if multiplier != 1 else text
         try:
-            return int(''.join(filter(str.isdigit, text)))
-        except:
-            return 0
+            return int(float(body) * multiplier)
+        except ValueError:
+            return int(''.join(filter(str.isdigit, text)) or 0)
     
     def _extract_reddit_images(self, submission) -> List[str]:
         """Extract images from Reddit submission"""
         images = []
         
-        if hasattr(submission, 'url') and any(
-            ext in submission.url.lower() 
-            for ext in ['.jpg', '.jpeg', '.png', '.gif']
-        ):
-            images.append(submission.url)
+        url = getattr(submission, 'url', None)
+        if url and IMG_EXT_RE.search(url):
+            images.append(url)
         
         if hasattr(submission, 'preview'):
             try:
@@ -434,14 +879,101 @@ class PublicContentScraper:
         return images
 
 
+class ResultCache:
+    """
+    Persistent record of already-emitted items, keyed by content_hash,
+    so scheduled sweeps only surface content they haven't seen before
+    """
+    
+    # SQLite's default host-parameter limit is 999
+    BATCH_SIZE = 500
+    
+    def __init__(self, path: str = "scraper_seen.db"):
+        if not AIOSQLITE_AVAILABLE:
+            raise RuntimeError("aiosqlite is required for ResultCache")
+        self.path = path
+        self._db = None
+        self._lock = asyncio.Lock()
+    
+    async def _connection(self):
+        if self._db is None:
+            self._db = await aiosqlite.connect(self.path)
+            await self._db.execute(
+                "CREATE TABLE IF NOT EXISTS seen (hash TEXT PRIMARY KEY, ts INTEGER, url TEXT)"
+            )
+            await self._db.commit()
+        return self._db
+    
+    async def filter_new(self, results: List[ScrapedContent]) -> List[ScrapedContent]:
+        """Return the results not seen before and record them as seen"""
+        if not results:
+            return results
+        
+        async with self._lock:
+            db = await self._connection()
+            hashes = [r.content_hash for r in results]
+            seen = set()
+            try:
+                await db.execute("BEGIN")
+                for i in range(0, len(hashes), self.BATCH_SIZE):
+                    batch = hashes[i:i + self.BATCH_SIZE]
+                    placeholders = ','.join('?' * len(batch))
+                    async with db.execute(
+                        f"SELECT hash FROM seen WHERE hash IN ({placeholders})", batch
+                    ) as cursor:
+                        seen.update(row[0] for row in await cursor.fetchall())
+                
+                new_results = []
+                for result in results:
+                    if result.content_hash not in seen:
+                        seen.add(result.content_hash)
+                        new_results.append(result)
+                
+                now = int(time.time())
+                await db.executemany(
+                    "INSERT OR IGNORE INTO seen (hash, ts, url) VALUES (?, ?, ?)",
+                    [(r.content_hash, now, r.url) for r in new_results]
+                )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        
+        return new_results
+    
+    async def close(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+
 class MonitoringOrchestrator:
     """
     Orchestrates all scraping activities
     Runs on schedule (cron-like)
     """
     
-    def __init__(self, scraper: PublicContentScraper):
+    def __init__(
+        self,
+        scraper: PublicContentScraper,
+        source_concurrency: int = 4,
+        cache: Optional[ResultCache] = None
+    ):
         self.scraper = scraper
+        # Optional cross-sweep cache; when set only new items are returned
+        self.cache = cache
+        # Per-source cap across concurrent sweeps, so one slow source
+        # can't tie up every sweep's slot for the others
+        self.source_concurrency = source_concurrency
+        self._source_semaphores: Dict[str, asyncio.Semaphore] = {}
+    
+    async def _run_source(self, label: str, coro) -> List[ScrapedContent]:
+        """Run one source's scrape under that source's semaphore"""
+        semaphore = self._source_semaphores.get(label)
+        if semaphore is None:
+            semaphore = self._source_semaphores[label] = asyncio.Semaphore(self.source_concurrency)
+        async with semaphore:
+            return await coro
     
     async def monitor_person(
         self,
@@ -458,69 +990,86 @@ class MonitoringOrchestrator:
         # Combine person name with aliases for search
         search_terms = [person_name] + aliases + keywords
         
-        # Twitter monitoring
+        # (label, count noun, coroutine) per source; sources hit disjoint
+        # hosts, so they all run concurrently
+        tasks = []
         if 'twitter' in social_handles:
-            twitter_results = await self.scraper.scrape_twitter_nitter(
+            tasks.append(('Twitter', 'mentions', self.scraper.scrape_twitter_nitter(
                 social_handles['twitter'],
                 search_terms
-            )
-            all_results.extend(twitter_results)
-            print(f"✅ Twitter: Found {len(twitter_results)} mentions")
-        
-        # Reddit monitoring
-        reddit_results = await self.scraper.scrape_reddit_praw(
+            )))
+        tasks.append(('Reddit', 'mentions', self.scraper.scrape_reddit_praw(
             subreddits=['all', 'news', 'worldnews'],
             keywords=search_terms
-        )
-        all_results.extend(reddit_results)
-        print(f"✅ Reddit: Found {len(reddit_results)} mentions")
-        
-        # Instagram monitoring
+        )))
         if 'instagram' in social_handles:
-            instagram_results = await self.scraper.scrape_instagram_public(
+            tasks.append(('Instagram', 'posts', self.scraper.scrape_instagram_public(
                 social_handles['instagram']
-            )
-            all_results.extend(instagram_results)
-            print(f"✅ Instagram: Found {len(instagram_results)} posts")
-        
-        # News monitoring
-        news_results = await self.scraper.scrape_news_rss(search_terms)
-        all_results.extend(news_results)
-        print(f"✅ Google News: Found {len(news_results)} articles")
-        
-        # NewsAPI (free tier)
-        newsapi_results = await self.scraper.scrape_news_api_free(search_terms)
-        all_results.extend(newsapi_results)
-        print(f"✅ NewsAPI: Found {len(newsapi_results)} articles")
-        
-        # TikTok monitoring
+            )))
+        tasks.append(('Google News', 'articles', self.scraper.scrape_news_rss(search_terms)))
+        tasks.append(('NewsAPI', 'articles', self.scraper.scrape_news_api_free(search_terms)))
         if 'tiktok' in social_handles:
-            tiktok_results = await self.scraper.scrape_tiktok_public(
+            tasks.append(('TikTok', 'videos', self.scraper.scrape_tiktok_public(
                 social_handles['tiktok']
-            )
-            all_results.extend(tiktok_results)
-            print(f"✅ TikTok: Found {len(tiktok_results)} videos")
+            )))
+        
+        outcomes = await asyncio.gather(
+            *(self._run_source(label, coro) for label, _, coro in tasks),
+            return_exceptions=True
+        )
+        
+        for (label, noun, _), outcome in zip(tasks, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("❌ %s: %s", label, outcome)
+                continue
+            all_results.extend(outcome)
+            logger.info("✅ %s: Found %d %s", label, len(outcome), noun)
         
         # Deduplicate by content hash
         unique_results = self._deduplicate(all_results)
+        if self.cache is not None:
+            unique_results = await self.cache.filter_new(unique_results)
         
-        print(f"\n📊 Total unique mentions: {len(unique_results)}")
+        logger.info("📊 Total unique mentions: %d", len(unique_results))
         
         return unique_results
     
     def _deduplicate(self, results: List[ScrapedContent]) -> List[ScrapedContent]:
-        """Remove duplicate content based on hash"""
+        """Remove exact duplicates by hash and near-duplicates via MinHash-LSH"""
         seen_hashes = set()
         unique = []
+        lsh = None
+        if DATASKETCH_AVAILABLE:
+            lsh = MinHashLSH(threshold=NEAR_DUPLICATE_THRESHOLD, num_perm=MINHASH_PERMUTATIONS)
         
-        for result in results:
-            if result.content_hash not in seen_hashes:
-                seen_hashes.add(result.content_hash)
-                unique.append(result)
+        for index, result in enumerate(results):
+            if result.content_hash in seen_hashes:
+                continue
+            
+            if lsh is not None:
+                shingles = _shingles(result.content_lower)
+                if shingles:
+                    minhash = MinHash(num_perm=MINHASH_PERMUTATIONS)
+                    minhash.update_batch([shingle.encode() for shingle in shingles])
+                    if lsh.query(minhash):
+                        continue
+                    lsh.insert(str(index), minhash)
+            
+            seen_hashes.add(result.content_hash)
+            unique.append(result)
         
         return unique
 
 
+def filter_threats(
+    results: List[ScrapedContent],
+    threat_re: re.Pattern = THREAT_RE
+) -> List[ScrapedContent]:
+    """Results whose content matches the threat pattern"""
+    search = threat_re.search
+    return [r for r in results if search(r.content)]
+
+
 # Example usage
 async def main():
     """
@@ -545,14 +1094,10 @@ async def main():
         keywords=["scam", "fraud", "fake", "deepfake", "controversy"]
     )
     
+    await scraper.close()
+    
     # Filter for potential threats
-    threats = [
-        r for r in results 
-        if any(
-            word in r.content.lower() 
-            for word in ['scam', 'fraud', 'fake', 'deepfake', 'lies']
-        )
-    ]
+    threats = filter_threats(results)
     
     print(f"\n🚨 Potential threats detected: {len(threats)}")
     for threat in threats[:5]:
@@ -5,37 +5,280 @@ Implements field-level encryption, end-to-end encryption, and key management
 
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
 import base64
+import hashlib
+import ipaddress
 import os
+import queue
+import re
 import secrets
-from typing import Dict, Any, Optional
+import struct
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, Iterable, List, Optional
 import json
 
+# RSA support is imported on first use; most workers only encrypt fields
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+# orjson encodes straight to bytes; fall back to the stdlib encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Leading byte of field tokens; Fernet tokens always start with 0x80
+FIELD_TOKEN_VERSION = b'\x01'
+FERNET_TOKEN_VERSION = 0x80
+
+# OWASP 2023 recommendation for PBKDF2-HMAC-SHA256
+PASSWORD_KDF_ITERATIONS = 600_000
+
+# Memory-hard scrypt is the default password KDF: N=2^15, r=8 uses 32 MiB
+SCRYPT_N = 2 ** 15
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+
+def _scrypt(password: bytes, salt: bytes, n: int) -> bytes:
+    # maxmem must cover 128 * r * n plus OpenSSL's bookkeeping
+    return hashlib.scrypt(
+        password, salt=salt, n=n, r=SCRYPT_R, p=SCRYPT_P,
+        maxmem=256 * SCRYPT_R * n, dklen=32
+    )
+
+
+def calibrate_scrypt_n(target_ms: float = 100.0, max_n: int = 2 ** 20) -> int:
+    """Largest power-of-two scrypt N whose derivation fits the time budget on this host"""
+    n = 2 ** 14
+    while n < max_n:
+        start = time.perf_counter()
+        _scrypt(b'calibration', b'\x00' * 16, n * 2)
+        if (time.perf_counter() - start) * 1000 > target_ms:
+            break
+        n *= 2
+    return n
+
+# Default sensitive-data patterns and their masks
+_DEFAULT_MASK_PATTERNS = {
+    r'\b\d{3}-\d{2}-\d{4}\b': '***-**-****',  # SSN
+    r'\b\d{16}\b': '****-****-****-****',      # Credit card
+    r'\b[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}\b': '***@***.***'  # Email
+}
+
+# The defaults fused into one alternation so the text is scanned once
+_DEFAULT_MASK_RE = re.compile(
+    '|'.join(f'(?P<p{i}>{pattern})' for i, pattern in enumerate(_DEFAULT_MASK_PATTERNS)),
+    re.IGNORECASE
+)
+_DEFAULT_MASK_REPL = {
+    f'p{i}': replacement for i, replacement in enumerate(_DEFAULT_MASK_PATTERNS.values())
+}
+
+# RSA private keys generated ahead of demand, per key size
+RSA_POOL_SIZE = 8
+RSA_MIN_KEY_SIZE = 1024
+# Only these sizes get a background filler; others are generated on demand
+RSA_POOLED_KEY_SIZES = frozenset({2048, 4096})
+
+
+def _generate_rsa_key(key_size: int) -> "rsa.RSAPrivateKey":
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    
+    return rsa.generate_private_key(
+        public_exponent=65537,
+        key_size=key_size,
+        backend=_BACKEND
+    )
+
+
+class _RSAKeyPool:
+    """Background threads keep a few fresh RSA keys ready per key size"""
+    
+    def __init__(self, size: int = RSA_POOL_SIZE):
+        self.size = size
+        self._queues: Dict[int, queue.Queue] = {}
+        self._errors: Dict[int, BaseException] = {}
+        self._lock = threading.Lock()
+    
+    def _fill(self, key_size: int, keys: queue.Queue):
+        try:
+            while True:
+                # Blocks once the pool is full; OpenSSL releases the GIL while generating
+                keys.put(_generate_rsa_key(key_size))
+        except Exception as e:
+            # Handed to the next get(), which also restarts the filler
+            self._errors[key_size] = e
+    
+    def _keys(self, key_size: int) -> queue.Queue:
+        """Queue for key_size, starting its filler on first use"""
+        keys = self._queues.get(key_size)
+        if keys is None:
+            with self._lock:
+                keys = self._queues.get(key_size)
+                if keys is None:
+                    keys = self._queues[key_size] = queue.Queue(maxsize=self.size)
+                    threading.Thread(
+                        target=self._fill,
+                        args=(key_size, keys),
+                        name=f"rsa-pool-{key_size}",
+                        daemon=True
+                    ).start()
+        return keys
+    
+    def get(self, key_size: int) -> "rsa.RSAPrivateKey":
+        """Take a never-before-issued key; generate inline if none is ready"""
+        if key_size not in RSA_POOLED_KEY_SIZES:
+            return _generate_rsa_key(key_size)
+        
+        keys = self._keys(key_size)
+        error = self._errors.pop(key_size, None)
+        if error is not None:
+            with self._lock:
+                self._queues.pop(key_size, None)
+            raise error
+        
+        try:
+            return keys.get_nowait()
+        except queue.Empty:
+            return _generate_rsa_key(key_size)
+
+
+_rsa_key_pool = _RSAKeyPool()
+
+# default_backend() is a singleton; bind it once
+_BACKEND = default_backend()
+
+
+@lru_cache(maxsize=None)
+def _oaep_sha256():
+    """Shared OAEP(SHA-256) padding, built on first RSA use"""
+    from cryptography.hazmat.primitives.asymmetric import padding
+    
+    return padding.OAEP(
+        mgf=padding.MGF1(algorithm=hashes.SHA256()),
+        algorithm=hashes.SHA256(),
+        label=None
+    )
+
+
+class _ParsedKeyCache:
+    """
+    Bounded LRU of parsed PEM keys, keyed by a BLAKE2b tag of the PEM so the
+    cache never holds the PEM text itself. (The key objects don't support
+    weak references, hence the explicit bound.)
+    """
+    
+    def __init__(self, loader, maxsize: int = 1024):
+        self._loader = loader
+        self.maxsize = maxsize
+        self._keys: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, pem: str):
+        pem_bytes = pem.encode()
+        tag = hashlib.blake2b(pem_bytes, digest_size=16).digest()
+        with self._lock:
+            key = self._keys.get(tag)
+            if key is not None:
+                self._keys.move_to_end(tag)
+                return key
+        
+        key = self._loader(pem_bytes)
+        with self._lock:
+            self._keys[tag] = key
+            if len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+        return key
+    
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+
+def _parse_public_key(pem: bytes):
+    from cryptography.hazmat.primitives import serialization
+    
+    return serialization.load_pem_public_key(pem, backend=_BACKEND)
+
+
+def _parse_private_key(pem: bytes):
+    from cryptography.hazmat.primitives import serialization
+    
+    return serialization.load_pem_private_key(pem, password=None, backend=_BACKEND)
+
+
+_public_keys = _ParsedKeyCache(_parse_public_key)
+_private_keys = _ParsedKeyCache(_parse_private_key)
+
 
 class AdvancedEncryptionService:
     """Advanced encryption service with multiple encryption methods"""
     
-    def __init__(self, master_key: Optional[bytes] = None):
+    FIELD_CIPHERS = ("aes-gcm", "fernet")
+    
+    def __init__(self, master_key: Optional[bytes] = None, field_cipher: str = "aes-gcm"):
         """
         Initialize encryption service
         
         Args:
             master_key: Master encryption key (32 bytes). If None, generates new key.
+            field_cipher: "aes-gcm" (single-pass AEAD, default) or "fernet"
+                (AES-128-CBC + HMAC, for consumers that only read Fernet tokens).
+                Both formats are always accepted on decrypt.
         """
+        if field_cipher not in self.FIELD_CIPHERS:
+            raise ValueError(f"Unsupported field cipher: {field_cipher}")
         if master_key is None:
             master_key = Fernet.generate_key()
         
         self.master_key = master_key
+        self.field_cipher = field_cipher
+        # Also decrypts fields written before the switch to AES-GCM
         self.fernet = Fernet(master_key)
+        
+        # Derive the field key and build the AEAD once, not per message
+        self._field_cipher = AESGCM(HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b'field-encryption',
+        ).derive(base64.urlsafe_b64decode(master_key)))
+    
+    def _encrypt_fast(self, data: bytes) -> bytes:
+        """AES-256-GCM with the cached field key: version || nonce || ciphertext+tag"""
+        nonce = os.urandom(12)
+        return FIELD_TOKEN_VERSION + nonce + self._field_cipher.encrypt(nonce, data, None)
+    
+    def _decrypt_fast(self, token: bytes) -> bytes:
+        """Inverse of _encrypt_fast"""
+        return self._field_cipher.decrypt(token[1:13], token[13:], None)
+    
+    def _encrypt_token(self, data: bytes) -> str:
+        """Encrypt bytes into a field token in the configured format"""
+        if self.field_cipher == "fernet":
+            return self.fernet.encrypt(data).decode()
+        return base64.urlsafe_b64encode(self._encrypt_fast(data)).decode()
+    
+    def _decrypt_token(self, encrypted_data: str) -> bytes:
+        """Decrypt a field token to bytes, accepting legacy Fernet tokens"""
+        token = base64.urlsafe_b64decode(encrypted_data)
+        if token[0] == FERNET_TOKEN_VERSION:
+            return self.fernet.decrypt(encrypted_data.encode())
+        return self._decrypt_fast(token)
     
     def encrypt_field(self, data: str) -> str:
         """
-        Encrypt a single field using Fernet (symmetric encryption)
+        Encrypt a single field (AES-256-GCM unless configured for Fernet)
         
         Args:
             data: Data to encrypt
@@ -46,8 +289,7 @@ class AdvancedEncryptionService:
         if not data:
             return data
         
-        encrypted = self.fernet.encrypt(data.encode())
-        return encrypted.decode()
+        return self._encrypt_token(data.encode())
     
     def decrypt_field(self, encrypted_data: str) -> str:
         """
@@ -62,8 +304,41 @@ class AdvancedEncryptionService:
         if not encrypted_data:
             return encrypted_data
         
-        decrypted = self.fernet.decrypt(encrypted_data.encode())
-        return decrypted.decode()
+        return self._decrypt_token(encrypted_data).decode()
+    
+    def encrypt_fields(self, data: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+        """
+        Encrypt the named fields of a record, leaving the rest untouched
+        
+        Args:
+            data: Record to encrypt
+            fields: Keys whose values are encrypted
+        
+        Returns:
+            Copy of the record with those fields encrypted
+        """
+        encrypted = dict(data)
+        for field in fields:
+            if field in encrypted:
+                encrypted[field] = self.encrypt_field(encrypted[field])
+        return encrypted
+    
+    def decrypt_fields(self, data: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+        """
+        Decrypt the named fields of a record
+        
+        Args:
+            data: Record with encrypted fields
+            fields: Keys whose values are decrypted
+        
+        Returns:
+            Copy of the record with those fields decrypted
+        """
+        decrypted = dict(data)
+        for field in fields:
+            if field in decrypted:
+                decrypted[field] = self.decrypt_field(decrypted[field])
+        return decrypted
     
     def encrypt_json(self, data: Dict[str, Any]) -> str:
         """
@@ -75,8 +350,12 @@ class AdvancedEncryptionService:
         Returns:
             Encrypted JSON string
         """
-        json_str = json.dumps(data)
-        return self.encrypt_field(json_str)
+        # Encrypt the encoded bytes directly, with no str round-trip
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = json.dumps(data).encode()
+        return self._encrypt_token(payload)
     
     def decrypt_json(self, encrypted_data: str) -> Dict[str, Any]:
         """
@@ -88,19 +367,21 @@ class AdvancedEncryptionService:
         Returns:
             Decrypted dictionary
         """
-        json_str = self.decrypt_field(encrypted_data)
-        return json.loads(json_str)
+        payload = self._decrypt_token(encrypted_data)
+        return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
     
-    def encrypt_with_aes_256(self, data: bytes, key: bytes) -> Dict[str, str]:
+    def encrypt_with_aes_256_bytes(self, data: bytes, key: bytes) -> bytes:
         """
-        Encrypt data using AES-256-GCM for authenticated encryption
+        Encrypt data using AES-256-GCM, returning one binary blob
+        
+        Suited to storage that holds bytes directly (e.g. a BYTEA column)
         
         Args:
             data: Data to encrypt
             key: 32-byte encryption key
         
         Returns:
-            Dictionary with encrypted data, nonce, and tag
+            nonce (12 bytes) || tag (16 bytes) || ciphertext
         """
         # Generate random nonce
         nonce = os.urandom(12)
@@ -109,16 +390,89 @@ class AdvancedEncryptionService:
         cipher = Cipher(
             algorithms.AES(key),
             modes.GCM(nonce),
-            backend=default_backend()
+            backend=_BACKEND
         )
         
         encryptor = cipher.encryptor()
         ciphertext = encryptor.update(data) + encryptor.finalize()
         
+        return b''.join((nonce, encryptor.tag, ciphertext))
+    
+    def decrypt_with_aes_256_bytes(self, blob: bytes, key: bytes) -> bytes:
+        """
+        Decrypt a blob produced by encrypt_with_aes_256_bytes
+        
+        Args:
+            blob: nonce || tag || ciphertext
+            key: 32-byte encryption key
+        
+        Returns:
+            Decrypted data
+        """
+        view = memoryview(blob)
+        
+        # Create cipher
+        cipher = Cipher(
+            algorithms.AES(key),
+            modes.GCM(bytes(view[:12]), bytes(view[12:28])),
+            backend=_BACKEND
+        )
+        
+        decryptor = cipher.decryptor()
+        return decryptor.update(view[28:]) + decryptor.finalize()
+    
+    def encrypt_with_aes_256_batch(self, items: List[bytes], key: bytes) -> bytes:
+        """
+        Encrypt several payloads as one AES-256-GCM message (one nonce, one tag)
+        
+        The item lengths are sealed inside the message, so the whole batch
+        is authenticated together and is split apart again on decrypt
+        
+        Args:
+            items: Payloads to encrypt
+            key: 32-byte encryption key
+        
+        Returns:
+            Blob in the encrypt_with_aes_256_bytes format
+        """
+        header = struct.pack(f'<I{len(items)}I', len(items), *map(len, items))
+        return self.encrypt_with_aes_256_bytes(header + b''.join(items), key)
+    
+    def decrypt_with_aes_256_batch(self, blob: bytes, key: bytes) -> List[bytes]:
+        """
+        Decrypt a blob produced by encrypt_with_aes_256_batch
+        
+        Returns:
+            The original payloads, in order
+        """
+        data = self.decrypt_with_aes_256_bytes(blob, key)
+        (count,) = struct.unpack_from('<I', data)
+        lengths = struct.unpack_from(f'<{count}I', data, 4)
+        
+        items = []
+        offset = 4 + 4 * count
+        for length in lengths:
+            items.append(data[offset:offset + length])
+            offset += length
+        return items
+    
+    def encrypt_with_aes_256(self, data: bytes, key: bytes) -> Dict[str, str]:
+        """
+        Encrypt data using AES-256-GCM for authenticated encryption
+        
+        Args:
+            data: Data to encrypt
+            key: 32-byte encryption key
+        
+        Returns:
+            Dictionary with encrypted data, nonce, and tag
+        """
+        blob = self.encrypt_with_aes_256_bytes(data, key)
+        
         return {
-            "ciphertext": base64.b64encode(ciphertext).decode(),
-            "nonce": base64.b64encode(nonce).decode(),
-            "tag": base64.b64encode(encryptor.tag).decode()
+            "ciphertext": base64.b64encode(blob[28:]).decode(),
+            "nonce": base64.b64encode(blob[:12]).decode(),
+            "tag": base64.b64encode(blob[12:28]).decode()
         }
     
     def decrypt_with_aes_256(
@@ -140,55 +494,49 @@ class AdvancedEncryptionService:
         Returns:
             Decrypted data
         """
-        # Decode from base64
-        ciphertext_bytes = base64.b64decode(ciphertext)
-        nonce_bytes = base64.b64decode(nonce)
-        tag_bytes = base64.b64decode(tag)
-        
-        # Create cipher
-        cipher = Cipher(
-            algorithms.AES(key),
-            modes.GCM(nonce_bytes, tag_bytes),
-            backend=default_backend()
-        )
-        
-        decryptor = cipher.decryptor()
-        plaintext = decryptor.update(ciphertext_bytes) + decryptor.finalize()
-        
-        return plaintext
+        blob = b''.join((
+            base64.b64decode(nonce),
+            base64.b64decode(tag),
+            base64.b64decode(ciphertext)
+        ))
+        return self.decrypt_with_aes_256_bytes(blob, key)
     
     def generate_key_from_password(
         self, 
         password: str, 
-        salt: Optional[bytes] = None
+        salt: Optional[bytes] = None,
+        algorithm: str = "scrypt",
+        iterations: int = PASSWORD_KDF_ITERATIONS,
+        scrypt_n: int = SCRYPT_N
     ) -> Dict[str, Any]:
         """
-        Derive encryption key from password using PBKDF2
+        Derive encryption key from password using scrypt (or PBKDF2-HMAC-SHA256)
         
         Args:
             password: User password
             salt: Salt for key derivation (generated if None)
+            algorithm: "scrypt" (memory-hard, default) or "pbkdf2"
+            iterations: PBKDF2 rounds; pass the stored value to re-derive
+            scrypt_n: scrypt cost; pass the stored value to re-derive
         
         Returns:
-            Dictionary with key and salt
+            Dictionary with key, salt, algorithm and its cost parameters
         """
         if salt is None:
             salt = os.urandom(16)
         
-        kdf = PBKDF2(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-            backend=default_backend()
-        )
-        
-        key = kdf.derive(password.encode())
+        result = {"salt": base64.b64encode(salt).decode(), "algorithm": algorithm}
+        if algorithm == "scrypt":
+            result["key"] = _scrypt(password.encode(), salt, scrypt_n)
+            result.update(n=scrypt_n, r=SCRYPT_R, p=SCRYPT_P)
+        elif algorithm == "pbkdf2":
+            # OpenSSL's native PBKDF2 loop
+            result["key"] = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations, dklen=32)
+            result["iterations"] = iterations
+        else:
+            raise ValueError(f"Unsupported key derivation algorithm: {algorithm}")
         
-        return {
-            "key": key,
-            "salt": base64.b64encode(salt).decode()
-        }
+        return result
     
     def generate_rsa_keypair(self, key_size: int = 2048) -> Dict[str, str]:
         """
@@ -200,11 +548,13 @@ class AdvancedEncryptionService:
         Returns:
             Dictionary with private and public keys (PEM format)
         """
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=key_size,
-            backend=default_backend()
-        )
+        from cryptography.hazmat.primitives import serialization
+        
+        if not isinstance(key_size, int) or key_size < RSA_MIN_KEY_SIZE:
+            raise ValueError(f"key_size must be an integer of at least {RSA_MIN_KEY_SIZE} bits")
+        
+        # Each call gets a unique key, usually generated ahead of time
+        private_key = _rsa_key_pool.get(key_size)
         
         public_key = private_key.public_key()
         
@@ -236,21 +586,8 @@ class AdvancedEncryptionService:
         Returns:
             Base64 encoded encrypted data
         """
-        # Load public key
-        public_key = serialization.load_pem_public_key(
-            public_key_pem.encode(),
-            backend=default_backend()
-        )
-        
-        # Encrypt
-        encrypted = public_key.encrypt(
-            data,
-            padding.OAEP(
-                mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                algorithm=hashes.SHA256(),
-                label=None
-            )
-        )
+        # Encrypt with the (cached) parsed key
+        encrypted = _public_keys.get(public_key_pem).encrypt(data, _oaep_sha256())
         
         return base64.b64encode(encrypted).decode()
     
@@ -269,23 +606,12 @@ class AdvancedEncryptionService:
         Returns:
             Decrypted data
         """
-        # Load private key
-        private_key = serialization.load_pem_private_key(
-            private_key_pem.encode(),
-            password=None,
-            backend=default_backend()
-        )
+        # Load private key (parsed once per distinct PEM)
+        private_key = _private_keys.get(private_key_pem)
         
         # Decrypt
         encrypted_bytes = base64.b64decode(encrypted_data)
-        decrypted = private_key.decrypt(
-            encrypted_bytes,
-            padding.OAEP(
-                mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                algorithm=hashes.SHA256(),
-                label=None
-            )
-        )
+        decrypted = private_key.decrypt(encrypted_bytes, _oaep_sha256())
         
         return decrypted
 
@@ -321,6 +647,20 @@ class DataAnonymizer:
         
         return f"{anonymized_local}@{anonymized_domain}"
     
+    @staticmethod
+    def anonymize_emails(emails: Iterable[str]) -> List[str]:
+        """
+        Anonymize a column of emails (e.g. a GDPR export or a pandas Series)
+        
+        Args:
+            emails: Email addresses
+        
+        Returns:
+            Anonymized emails, in input order
+        """
+        anonymize = DataAnonymizer.anonymize_email
+        return [anonymize(email) for email in emails]
+    
     @staticmethod
     def anonymize_phone(phone: str) -> str:
         """
@@ -348,17 +688,45 @@ class DataAnonymizer:
         Returns:
             Anonymized IP
         """
-        parts = ip_address.split('.')
-        if len(parts) == 4:
+        try:
+            address = ipaddress.ip_address(ip_address.strip())
+        except ValueError:
+            return '***'
+        
+        # Mask with integer shifts on the parsed address
+        value = int(address)
+        if address.version == 4:
             # Keep first two octets for IPv4
-            return f"{parts[0]}.{parts[1]}.***. ***"
+            return f"{value >> 24}.{(value >> 16) & 0xFF}.***.***"
         
-        # IPv6 - keep first 4 groups
-        parts = ip_address.split(':')
-        if len(parts) >= 4:
-            return ':'.join(parts[:4]) + ':****:****:****:****'
+        # IPv6 - keep the /64 network prefix
+        prefix = value >> 64
+        return (
+            f"{prefix >> 48:x}:{(prefix >> 32) & 0xFFFF:x}:"
+            f"{(prefix >> 16) & 0xFFFF:x}:{prefix & 0xFFFF:x}:****:****:****:****"
+        )
+    
+    @staticmethod
+    def anonymize_ip_bulk(ip_addresses: List[str]) -> List[str]:
+        """
+        Anonymize a column of IPs (e.g. access logs), parsing each distinct
+        address once
         
-        return '***'
+        Args:
+            ip_addresses: IPs to anonymize
+        
+        Returns:
+            Anonymized IPs, in input order
+        """
+        anonymize = DataAnonymizer.anonymize_ip
+        seen: Dict[str, str] = {}
+        results = []
+        for ip in ip_addresses:
+            masked = seen.get(ip)
+            if masked is None:
+                masked = seen[ip] = anonymize(ip)
+            results.append(masked)
+        return results
     
     @staticmethod
     def generate_pseudonym(original_id: str, salt: str) -> str:
@@ -380,6 +748,30 @@ class DataAnonymizer:
         # Return first 16 characters for readability
         return f"user_{hashed[:16]}"
     
+    @staticmethod
+    def pseudonymize_bulk(original_ids: List[str], salt: str) -> List[str]:
+        """
+        Generate pseudonyms for many IDs at once (e.g. GDPR exports)
+        
+        Same output as generate_pseudonym, with the salt encoded once
+        and no per-ID method call or string formatting
+        
+        Args:
+            original_ids: Original identifiers
+            salt: Salt for hashing
+        
+        Returns:
+            Pseudonymized IDs, in input order
+        """
+        import hashlib
+        
+        sha256 = hashlib.sha256
+        salt_bytes = salt.encode()
+        return [
+            "user_" + sha256(original_id.encode() + salt_bytes).hexdigest()[:16]
+            for original_id in original_ids
+        ]
+    
     @staticmethod
     def mask_sensitive_data(text: str, patterns: Dict[str, str]) -> str:
         """
@@ -392,18 +784,11 @@ class DataAnonymizer:
         Returns:
             Masked text
         """
-        import re
+        if not patterns:
+            return _DEFAULT_MASK_RE.sub(lambda m: _DEFAULT_MASK_REPL[m.lastgroup], text)
         
         masked = text
-        
-        # Default patterns
-        default_patterns = {
-            r'\b\d{3}-\d{2}-\d{4}\b': '***-**-****',  # SSN
-            r'\b\d{16}\b': '****-****-****-****',      # Credit card
-            r'\b[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}\b': '***@***.***'  # Email
-        }
-        
-        all_patterns = {**default_patterns, **patterns}
+        all_patterns = {**_DEFAULT_MASK_PATTERNS, **patterns}
         
         for pattern, replacement in all_patterns.items():
             masked = re.sub(pattern, replacement, masked, flags=re.IGNORECASE)
@@ -3,21 +3,63 @@ Multi-Factor Authentication (MFA) Service
 Supports TOTP, SMS, and Email-based 2FA
 """
 
-import pyotp
-import qrcode
 import io
+import time
 import base64
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Tuple
+import random
 import secrets
 import hashlib
+import hmac
+import struct
+from functools import lru_cache
+
+
+# Email verification codes; drawn from the OS CSPRNG
+EMAIL_CODE_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+_system_random = random.SystemRandom()
+
+# RFC 6238 parameters used by generate_totp_secret
+TOTP_DIGITS = 6
+TOTP_PERIOD = 30
+_TOTP_MODULUS = 10 ** TOTP_DIGITS
+
+
+def _totp_key(secret: str) -> bytes:
+    """Decode a base32 TOTP secret, tolerating missing padding and lowercase"""
+    return base64.b32decode(secret + '=' * (-len(secret) % 8), casefold=True)
+
+
+def _hotp(key: bytes, counter: int) -> str:
+    """RFC 4226 HOTP value: HMAC-SHA1 of the counter, dynamically truncated"""
+    digest = hmac.digest(key, struct.pack('>Q', counter), 'sha1')
+    offset = digest[-1] & 0x0F
+    code = (struct.unpack_from('>I', digest, offset)[0] & 0x7FFFFFFF) % _TOTP_MODULUS
+    return f"{code:0{TOTP_DIGITS}d}"
+
+
+# A user presents only a handful of UA/IP pairs, so repeat logins hit the cache
+@lru_cache(maxsize=1024)
+def _fp_impl(user_agent: str, ip_address: str) -> str:
+    """SHA-256 hex fingerprint of a user agent and IP address"""
+    return hashlib.sha256(f"{user_agent}|{ip_address}".encode()).hexdigest()
 
 
 class MFAService:
     """Multi-Factor Authentication service supporting multiple 2FA methods"""
     
-    def __init__(self):
+    def __init__(self, qr_format: str = "svg"):
+        """
+        Args:
+            qr_format: Enrolment QR image format, "svg" (default; small and
+                needs no Pillow) or "png"
+        """
+        if qr_format not in ("svg", "png"):
+            raise ValueError(f"Unsupported QR format: {qr_format}")
         self.issuer_name = "AI Guardian"
+        self.qr_format = qr_format
     
     def generate_totp_secret(self, user_email: str) -> Dict[str, str]:
         """
@@ -26,6 +68,8 @@ class MFAService:
         Returns:
             Dictionary with secret, provisioning URI, and QR code
         """
+        import pyotp  # imported on first use to keep worker start-up light
+        
         # Generate random secret
         secret = pyotp.random_base32()
         
@@ -46,8 +90,8 @@ class MFAService:
             "provisioning_uri": provisioning_uri,
             "qr_code": qr_code,
             "algorithm": "SHA1",
-            "digits": 6,
-            "period": 30
+            "digits": TOTP_DIGITS,
+            "period": TOTP_PERIOD
         }
     
     def verify_totp(self, secret: str, token: str, window: int = 1) -> bool:
@@ -62,8 +106,17 @@ class MFAService:
         Returns:
             True if token is valid
         """
-        totp = pyotp.TOTP(secret)
-        return totp.verify(token, valid_window=window)
+        # HMAC-SHA1 directly (RFC 6238) rather than building a pyotp.TOTP per call
+        token = str(token)
+        # Only ASCII digits can match; compare_digest also rejects non-ASCII str
+        if len(token) != TOTP_DIGITS or not token.isascii() or not token.isdigit():
+            return False
+        key = _totp_key(secret)
+        counter = int(time.time()) // TOTP_PERIOD
+        return any(
+            hmac.compare_digest(_hotp(key, counter + offset), token)
+            for offset in range(-window, window + 1)
+        )
     
     def generate_backup_codes(self, count: int = 10) -> list[str]:
         """
@@ -75,15 +128,21 @@ class MFAService:
         Returns:
             List of backup codes
         """
-        codes = []
-        for _ in range(count):
-            # Generate 8-character alphanumeric code
-            code = secrets.token_hex(4).upper()
-            # Format as XXXX-XXXX for readability
-            formatted_code = f"{code[:4]}-{code[4:]}"
-            codes.append(formatted_code)
+        # One entropy draw for the batch: 8 hex characters per code
+        hexed = secrets.token_hex(4 * count).upper()
         
-        return codes
+        # Format as XXXX-XXXX for readability
+        return [f"{hexed[i:i + 4]}-{hexed[i + 4:i + 8]}" for i in range(0, 8 * count, 8)]
+    
+    def generate_hashed_backup_codes(self, count: int = 10) -> Tuple[List[str], List[str]]:
+        """
+        Generate backup codes together with their storage hashes
+        
+        Returns:
+            (codes to show the user once, hashes to store)
+        """
+        codes = self.generate_backup_codes(count)
+        return codes, self.hash_backup_codes(codes)
     
     def hash_backup_code(self, code: str) -> str:
         """
@@ -97,6 +156,19 @@ class MFAService:
         """
         return hashlib.sha256(code.encode()).hexdigest()
     
+    def hash_backup_codes(self, codes: List[str]) -> List[str]:
+        """
+        Hash a batch of backup codes for secure storage
+        
+        Args:
+            codes: The backup codes to hash
+        
+        Returns:
+            Hashed codes, in input order
+        """
+        sha256 = hashlib.sha256
+        return [sha256(code.encode()).hexdigest() for code in codes]
+    
     def verify_backup_code(self, code: str, hashed_code: str) -> bool:
         """
         Verify a backup code against its hash
@@ -108,7 +180,7 @@ class MFAService:
         Returns:
             True if code is valid
         """
-        return self.hash_backup_code(code) == hashed_code
+        return hmac.compare_digest(self.hash_backup_code(code), hashed_code)
     
     def generate_sms_code(self, length: int = 6) -> str:
         """
@@ -120,9 +192,8 @@ class MFAService:
         Returns:
             Numeric code as string
         """
-        # Generate random number with specified length
-        code = ''.join([str(secrets.randbelow(10)) for _ in range(length)])
-        return code
+        # One uniform draw, zero-padded to the requested length
+        return f"{secrets.randbelow(10 ** length):0{length}d}"
     
     def generate_email_code(self, length: int = 6) -> str:
         """
@@ -134,10 +205,8 @@ class MFAService:
         Returns:
             Alphanumeric code
         """
-        # Generate alphanumeric code
-        alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
-        code = ''.join(secrets.choice(alphabet) for _ in range(length))
-        return code
+        # SystemRandom is os.urandom-backed, like secrets.choice
+        return ''.join(_system_random.choices(EMAIL_CODE_ALPHABET, k=length))
     
     def _generate_qr_code(self, data: str) -> str:
         """
@@ -147,8 +216,10 @@ class MFAService:
             data: Data to encode in QR code
         
         Returns:
-            Base64 encoded PNG image
+            Base64 encoded SVG or PNG image, as a data URI
         """
+        import qrcode  # only needed at TOTP enrolment
+        
         # Create QR code
         qr = qrcode.QRCode(
             version=1,
@@ -159,16 +230,21 @@ class MFAService:
         qr.add_data(data)
         qr.make(fit=True)
         
-        # Create image
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Convert to base64
         buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        img_base64 = base64.b64encode(buffer.getvalue()).decode()
+        if self.qr_format == "svg":
+            # A single vector path: no rasterising and no zlib pass
+            from qrcode.image.svg import SvgPathImage
+            
+            qr.make_image(image_factory=SvgPathImage).save(buffer)
+            mime = "image/svg+xml"
+        else:
+            img = qr.make_image(fill_color="black", back_color="white")
+            # A two-colour matrix barely benefits from heavier compression
+            img.save(buffer, format='PNG', compress_level=1)
+            mime = "image/png"
         
-        return f"data:image/png;base64,{img_base64}"
+        img_base64 = base64.b64encode(buffer.getvalue()).decode()
+        return f"data:{mime};base64,{img_base64}"
     
     def create_session_token(self, user_id: int, expires_in: int = 300) -> Dict[str, Any]:
         """
@@ -191,6 +267,10 @@ class MFAService:
             "verified": False
         }
     
+    def generate_device_fingerprint(self, user_agent: str, ip_address: str) -> str:
+        """Device fingerprint for trusted device functionality"""
+        return _fp_impl(user_agent, ip_address)
+    
     def validate_device_fingerprint(
         self, 
         user_agent: str, 
@@ -208,11 +288,9 @@ class MFAService:
         Returns:
             Fingerprint info and validation result
         """
-        # Create fingerprint from device characteristics
-        fingerprint_data = f"{user_agent}|{ip_address}"
-        fingerprint = hashlib.sha256(fingerprint_data.encode()).hexdigest()
+        fingerprint = _fp_impl(user_agent, ip_address)
         
-        is_trusted = stored_fingerprint == fingerprint if stored_fingerprint else False
+        is_trusted = hmac.compare_digest(stored_fingerprint, fingerprint) if stored_fingerprint else False
         
         return {
             "fingerprint": fingerprint,
@@ -221,6 +299,14 @@ class MFAService:
         }
 
 
+@dataclass(slots=True)
+class _AttemptState:
+    """Per-user attempt counters; times are epoch seconds (0 = unset)"""
+    count: int = 0
+    locked_until: float = 0.0
+    last_attempt: float = 0.0
+
+
 class MFAAttemptTracker:
     """Track and limit MFA verification attempts to prevent brute force"""
     
@@ -234,7 +320,15 @@ class MFAAttemptTracker:
         """
         self.max_attempts = max_attempts
         self.lockout_duration = lockout_duration
-        self.attempts = {}  # In production, use Redis
+        self.attempts: Dict[int, _AttemptState] = {}  # In production, use Redis
+    
+    def _locked_response(self, locked_until: float) -> Dict[str, Any]:
+        return {
+            "allowed": False,
+            "locked": True,
+            "locked_until": datetime.fromtimestamp(locked_until, timezone.utc).replace(tzinfo=None),
+            "remaining_attempts": 0
+        }
     
     def record_attempt(self, user_id: int, success: bool) -> Dict[str, Any]:
         """
@@ -247,71 +341,154 @@ class MFAAttemptTracker:
         Returns:
             Attempt status
         """
-        if user_id not in self.attempts:
-            self.attempts[user_id] = {
-                "count": 0,
-                "locked_until": None,
-                "last_attempt": None
-            }
+        state = self.attempts.get(user_id)
+        if state is None:
+            state = self.attempts[user_id] = _AttemptState()
         
-        user_attempts = self.attempts[user_id]
+        now = time.time()
         
         # Check if currently locked out
-        if user_attempts["locked_until"]:
-            if datetime.utcnow() < user_attempts["locked_until"]:
-                return {
-                    "allowed": False,
-                    "locked": True,
-                    "locked_until": user_attempts["locked_until"],
-                    "remaining_attempts": 0
-                }
-            else:
-                # Lockout expired, reset
-                user_attempts["count"] = 0
-                user_attempts["locked_until"] = None
+        if state.locked_until:
+            if now < state.locked_until:
+                return self._locked_response(state.locked_until)
+            # Lockout expired, reset
+            state.count = 0
+            state.locked_until = 0.0
         
         if success:
             # Reset on success
-            user_attempts["count"] = 0
-            user_attempts["locked_until"] = None
+            state.count = 0
+            state.locked_until = 0.0
         else:
             # Increment failed attempts
-            user_attempts["count"] += 1
-            user_attempts["last_attempt"] = datetime.utcnow()
+            state.count += 1
+            state.last_attempt = now
             
             # Lock if max attempts reached
-            if user_attempts["count"] >= self.max_attempts:
-                user_attempts["locked_until"] = (
-                    datetime.utcnow() + timedelta(seconds=self.lockout_duration)
-                )
-                return {
-                    "allowed": False,
-                    "locked": True,
-                    "locked_until": user_attempts["locked_until"],
-                    "remaining_attempts": 0
-                }
-        
-        remaining = self.max_attempts - user_attempts["count"]
+            if state.count >= self.max_attempts:
+                state.locked_until = now + self.lockout_duration
+                return self._locked_response(state.locked_until)
         
         return {
             "allowed": True,
             "locked": False,
-            "remaining_attempts": remaining,
-            "attempts_used": user_attempts["count"]
+            "remaining_attempts": self.max_attempts - state.count,
+            "attempts_used": state.count
         }
     
     def is_locked_out(self, user_id: int) -> bool:
         """Check if a user is currently locked out"""
-        if user_id not in self.attempts:
-            return False
+        state = self.attempts.get(user_id)
+        return state is not None and time.time() < state.locked_until
+    
+    def locked_out_users(self, user_ids: List[int]) -> List[bool]:
+        """is_locked_out for many users against a single clock read"""
+        now = time.time()
+        attempts = self.attempts
+        return [
+            (state := attempts.get(user_id)) is not None and now < state.locked_until
+            for user_id in user_ids
+        ]
+    
+    def reset_attempts(self, user_id: int):
+        """Reset attempts for a user (e.g., after successful login)"""
+        self.attempts.pop(user_id, None)
+
+
+# Check-and-record in one atomic round trip. State is a hash with count and
+# locked_until (epoch ms); returns {allowed, count, locked_until}
+_RECORD_ATTEMPT_LUA = """
+local state = redis.call('HMGET', KEYS[1], 'count', 'locked_until')
+local count = tonumber(state[1] or '0')
+local locked_until = tonumber(state[2] or '0')
+local max_attempts = tonumber(ARGV[2])
+local lockout_ms = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+
+if locked_until > 0 then
+    if now < locked_until then
+        return {0, count, locked_until}
+    end
+    count = 0
+    locked_until = 0
+end
+
+if ARGV[1] == '1' then
+    redis.call('DEL', KEYS[1])
+    return {1, 0, 0}
+end
+
+count = count + 1
+if count >= max_attempts then
+    locked_until = now + lockout_ms
+end
+redis.call('HSET', KEYS[1], 'count', count, 'locked_until', locked_until, 'last_attempt', now)
+redis.call('PEXPIRE', KEYS[1], lockout_ms)
+
+if locked_until > 0 then
+    return {0, count, locked_until}
+end
+return {1, count, 0}
+"""
+
+
+class RedisMFAAttemptTracker(MFAAttemptTracker):
+    """
+    MFAAttemptTracker backed by Redis, shared by every worker
+    
+    Failed-attempt counters expire after lockout_duration of inactivity
+    """
+    
+    KEY_PREFIX = "mfa:att:"
+    
+    def __init__(self, redis_client, max_attempts: int = 5, lockout_duration: int = 900):
+        """
+        Args:
+            redis_client: A redis.Redis client
+            max_attempts: Maximum failed attempts before lockout
+            lockout_duration: Lockout duration in seconds (default 15 min)
+        """
+        super().__init__(max_attempts, lockout_duration)
+        self.redis = redis_client
+        self._record_script = redis_client.register_script(_RECORD_ATTEMPT_LUA)
+    
+    def _key(self, user_id: int) -> str:
+        return f"{self.KEY_PREFIX}{user_id}"
+    
+    def record_attempt(self, user_id: int, success: bool) -> Dict[str, Any]:
+        """Record a verification attempt atomically in Redis"""
+        allowed, count, locked_until_ms = self._record_script(
+            keys=[self._key(user_id)],
+            args=[
+                1 if success else 0,
+                self.max_attempts,
+                self.lockout_duration * 1000,
+                time.time_ns() // 1_000_000
+            ]
+        )
         
-        user_attempts = self.attempts[user_id]
-        if user_attempts["locked_until"]:
-            return datetime.utcnow() < user_attempts["locked_until"]
+        if not allowed:
+            return self._locked_response(int(locked_until_ms) / 1000)
         
-        return False
+        return {
+            "allowed": True,
+            "locked": False,
+            "remaining_attempts": self.max_attempts - int(count),
+            "attempts_used": int(count)
+        }
+    
+    def is_locked_out(self, user_id: int) -> bool:
+        """Check if a user is currently locked out"""
+        return self.locked_out_users([user_id])[0]
+    
+    def locked_out_users(self, user_ids: List[int]) -> List[bool]:
+        """is_locked_out for many users in one pipelined round trip"""
+        pipe = self.redis.pipeline(transaction=False)
+        for user_id in user_ids:
+            pipe.hget(self._key(user_id), "locked_until")
+        now_ms = time.time_ns() // 1_000_000
+        return [bool(value) and now_ms < int(value) for value in pipe.execute()]
     
     def reset_attempts(self, user_id: int):
         """Reset attempts for a user (e.g., after successful login)"""
-        if user_id in self.attempts:
-            del self.attempts[user_id]
+        self.redis.delete(self._key(user_id))
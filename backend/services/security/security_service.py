@@ -3,13 +3,83 @@ Security & Privacy Module
 Encryption, RBAC, audit logs, GDPR/NDPR compliance
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import Counter, defaultdict
+from functools import lru_cache
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+import atexit
+import bisect
 import hashlib
+import itertools
+import logging
+import os
 import secrets
 import json
+import sys
+import queue
+import threading
+import time
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# orjson encodes straight to bytes; fall back to the stdlib encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _intern(value):
+    """sys.intern for str values; anything else (None, int IDs) passes through"""
+    return sys.intern(value) if type(value) is str else value
+
+
+# Audit log IDs: time + pid + per-process sequence, unique without a CSPRNG read
+_log_counter = itertools.count()
+_pid = os.getpid()
+
+
+def _reset_log_id_state():
+    global _log_counter, _pid
+    _log_counter = itertools.count()
+    _pid = os.getpid()
+
+
+os.register_at_fork(after_in_child=_reset_log_id_state)
+
+
+# Argon2id defaults for hash_sensitive_data (about 9 ms on a modern core)
+ARGON2_TIME_COST = 3
+ARGON2_MEMORY_COST = 2048  # KiB
+ARGON2_PARALLELISM = 1
+
+
+def calibrate_argon2_memory_cost(
+    target_ms: float = 100.0,
+    time_cost: int = ARGON2_TIME_COST,
+    max_memory_cost: int = 1024 * 1024
+) -> int:
+    """Largest power-of-two memory_cost (KiB) whose hash fits the time budget on this host"""
+    memory_cost = ARGON2_MEMORY_COST
+    while memory_cost < max_memory_cost:
+        hasher = PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost * 2,
+            parallelism=ARGON2_PARALLELISM
+        )
+        start = time.perf_counter()
+        hasher.hash("calibration")
+        if (time.perf_counter() - start) * 1000 > target_ms:
+            break
+        memory_cost *= 2
+    return memory_cost
 
 
 class UserRole(Enum):
@@ -36,23 +106,23 @@ class Permission(Enum):
 
 # Role-Permission mapping
 ROLE_PERMISSIONS = {
-    UserRole.VIEWER: [
+    UserRole.VIEWER: frozenset({
         Permission.VIEW_DASHBOARD,
         Permission.VIEW_MENTIONS
-    ],
-    UserRole.ANALYST: [
+    }),
+    UserRole.ANALYST: frozenset({
         Permission.VIEW_DASHBOARD,
         Permission.VIEW_MENTIONS,
         Permission.EXPORT_DATA
-    ],
-    UserRole.MANAGER: [
+    }),
+    UserRole.MANAGER: frozenset({
         Permission.VIEW_DASHBOARD,
         Permission.VIEW_MENTIONS,
         Permission.EXPORT_DATA,
         Permission.CONFIGURE_ALERTS,
         Permission.MANAGE_ENTITIES
-    ],
-    UserRole.ADMIN: [
+    }),
+    UserRole.ADMIN: frozenset({
         Permission.VIEW_DASHBOARD,
         Permission.VIEW_MENTIONS,
         Permission.EXPORT_DATA,
@@ -61,12 +131,25 @@ ROLE_PERMISSIONS = {
         Permission.MANAGE_USERS,
         Permission.ACCESS_API,
         Permission.VIEW_AUDIT_LOGS
-    ],
-    UserRole.SUPER_ADMIN: list(Permission)  # All permissions
+    }),
+    UserRole.SUPER_ADMIN: frozenset(Permission)  # All permissions
 }
 
+# Permissions as bits, so a user's effective permissions are one int
+PERM_BIT = {permission: 1 << i for i, permission in enumerate(Permission)}
+ROLE_MASK = {
+    role: sum(PERM_BIT[permission] for permission in permissions)
+    for role, permissions in ROLE_PERMISSIONS.items()
+}
+
+
+@lru_cache(maxsize=1024)
+def permissions_from_mask(mask: int) -> Tuple[Permission, ...]:
+    """Decode a permission bitmask (few distinct masks exist, so this is cached)"""
+    return tuple(permission for permission, bit in PERM_BIT.items() if mask & bit)
 
-@dataclass
+
+@dataclass(slots=True)
 class AuditLogEntry:
     """Audit log entry for compliance"""
     log_id: str
@@ -98,56 +181,90 @@ class AuditLogEntry:
 class EncryptionService:
     """Handle data encryption/decryption"""
     
-    def __init__(self, encryption_key: Optional[str] = None):
+    def __init__(self, encryption_key: Optional[str] = None, argon2_target_ms: Optional[float] = None):
         """
         Initialize encryption service
         
         Args:
             encryption_key: Base encryption key (should be from secure storage)
+            argon2_target_ms: If set, tune Argon2 memory_cost to this per-hash
+                budget at startup instead of using the defaults
         """
         self.encryption_key = encryption_key or self._generate_key()
+        self._key_bytes = self._key_material(self.encryption_key)
+        # One AEAD instance, so the AES key schedule is computed once
+        self._aead = AESGCM(self._key_bytes)
+        # Keyed once; pseudonymize copies this state instead of re-keying per call
+        self._pseudonym_hash = hashlib.blake2b(
+            digest_size=16, key=self._key_bytes, person=b'pseudonym'
+        )
+        
+        memory_cost = ARGON2_MEMORY_COST
+        if argon2_target_ms is not None:
+            memory_cost = calibrate_argon2_memory_cost(argon2_target_ms)
+        self._argon2_params = {
+            "time_cost": ARGON2_TIME_COST,
+            "memory_cost": memory_cost,
+            "parallelism": ARGON2_PARALLELISM
+        }
+        self._ph = PasswordHasher(**self._argon2_params)
     
     def _generate_key(self) -> str:
-        """Generate a secure encryption key"""
-        return secrets.token_hex(32)
+        """Generate a secure 256-bit encryption key (hex encoded)"""
+        return AESGCM.generate_key(bit_length=256).hex()
+    
+    @staticmethod
+    def _key_material(encryption_key: str) -> bytes:
+        """32-byte AES key: the key itself if 64 hex chars, else its SHA-256"""
+        if len(encryption_key) == 64:
+            try:
+                return bytes.fromhex(encryption_key)
+            except ValueError:
+                pass
+        return hashlib.sha256(encryption_key.encode()).digest()
     
     def encrypt(self, data: str) -> str:
         """
-        Encrypt sensitive data
-        
-        In production: Use AES-256, Fernet, or AWS KMS
-        """
-        # Placeholder for actual encryption
-        # In production: Use cryptography.fernet or similar
-        """
-        from cryptography.fernet import Fernet
+        Encrypt sensitive data with AES-256-GCM
         
-        f = Fernet(self.encryption_key.encode())
-        encrypted = f.encrypt(data.encode())
-        return encrypted.decode()
+        Returns:
+            Hex of nonce (12 bytes) || ciphertext || tag
         """
-        # Simple hash for demo (NOT SECURE - use real encryption in production)
-        return hashlib.sha256(f"{data}{self.encryption_key}".encode()).hexdigest()
+        nonce = os.urandom(12)
+        return (nonce + self._aead.encrypt(nonce, data.encode(), None)).hex()
     
     def decrypt(self, encrypted_data: str) -> str:
         """
-        Decrypt sensitive data
+        Decrypt data produced by encrypt
         
-        In production: Use matching decryption algorithm
+        Raises:
+            cryptography.exceptions.InvalidTag: if the data was tampered with
+                or encrypted under a different key
         """
-        # Placeholder for actual decryption
+        blob = bytes.fromhex(encrypted_data)
+        return self._aead.decrypt(blob[:12], blob[12:], None).decode()
+    
+    def hash_sensitive_data(self, data: str) -> str:
+        """One-way salted Argon2id hash for passwords, etc. (PHC string format)"""
+        return self._ph.hash(data)
+    
+    def verify_sensitive_data(self, hashed: str, data: str) -> bool:
+        """Check data against a hash_sensitive_data result"""
+        try:
+            return self._ph.verify(hashed, data)
+        except (VerifyMismatchError, InvalidHashError):
+            return False
+    
+    def pseudonymize(self, data: str) -> str:
         """
-        from cryptography.fernet import Fernet
+        Deterministic keyed ID for anonymization (not for passwords)
         
-        f = Fernet(self.encryption_key.encode())
-        decrypted = f.decrypt(encrypted_data.encode())
-        return decrypted.decode()
+        BLAKE2b keyed with the service key, so IDs can't be reversed by
+        hashing candidate inputs without the key
         """
-        return encrypted_data  # Placeholder
-    
-    def hash_sensitive_data(self, data: str) -> str:
-        """One-way hash for passwords, etc."""
-        return hashlib.sha256(data.encode()).hexdigest()
+        h = self._pseudonym_hash.copy()
+        h.update(data.encode())
+        return h.hexdigest()
 
 
 class RBACService:
@@ -156,10 +273,19 @@ class RBACService:
     def __init__(self):
         self.user_roles: Dict[str, UserRole] = {}
         self.custom_permissions: Dict[str, List[Permission]] = {}
+        # Effective permission bitmask per user (role | custom grants)
+        self.user_mask: Dict[str, int] = {}
+    
+    def _refresh_mask(self, user_id: str):
+        mask = ROLE_MASK.get(self.user_roles.get(user_id), 0)
+        for permission in self.custom_permissions.get(user_id, ()):
+            mask |= PERM_BIT[permission]
+        self.user_mask[user_id] = mask
     
     def assign_role(self, user_id: str, role: UserRole):
         """Assign a role to a user"""
         self.user_roles[user_id] = role
+        self._refresh_mask(user_id)
     
     def grant_permission(self, user_id: str, permission: Permission):
         """Grant a custom permission to a user"""
@@ -168,6 +294,7 @@ class RBACService:
         
         if permission not in self.custom_permissions[user_id]:
             self.custom_permissions[user_id].append(permission)
+        self.user_mask[user_id] = self.user_mask.get(user_id, 0) | PERM_BIT[permission]
     
     def check_permission(self, user_id: str, permission: Permission) -> bool:
         """
@@ -180,39 +307,83 @@ class RBACService:
         Returns:
             True if user has permission
         """
-        # Check custom permissions first
-        if user_id in self.custom_permissions:
-            if permission in self.custom_permissions[user_id]:
-                return True
-        
-        # Check role-based permissions
-        if user_id in self.user_roles:
-            role = self.user_roles[user_id]
-            return permission in ROLE_PERMISSIONS.get(role, [])
+        mask = self.user_mask.get(user_id)
+        # Unknown users return before hashing the Permission enum (a Python-level __hash__)
+        if not mask:
+            return False
+        return bool(mask & PERM_BIT[permission])
+    
+    def check_permissions_bulk(self, user_id: str, permissions: Iterable[Permission]) -> int:
+        """
+        Check several permissions with one mask AND
         
-        return False
+        Returns:
+            Bitmask of the requested permissions the user holds (see PERM_BIT)
+        """
+        mask = self.user_mask.get(user_id)
+        if not mask:
+            return 0
+        requested = 0
+        for permission in permissions:
+            requested |= PERM_BIT[permission]
+        return mask & requested
     
     def get_user_permissions(self, user_id: str) -> List[Permission]:
         """Get all permissions for a user"""
-        permissions = set()
-        
-        # Add role permissions
-        if user_id in self.user_roles:
-            role = self.user_roles[user_id]
-            permissions.update(ROLE_PERMISSIONS.get(role, []))
-        
-        # Add custom permissions
-        if user_id in self.custom_permissions:
-            permissions.update(self.custom_permissions[user_id])
-        
-        return list(permissions)
+        return list(permissions_from_mask(self.user_mask.get(user_id, 0)))
+    
+    def get_user_permission_masks(self, user_ids: List[str]) -> Dict[str, int]:
+        """Permission bitmasks for many users; decode with permissions_from_mask"""
+        masks = self.user_mask
+        return {user_id: masks.get(user_id, 0) for user_id in user_ids}
 
 
 class AuditLogger:
     """Audit logging for compliance (GDPR, SOC 2, etc.)"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        sink_path: Optional[str] = None,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        max_pending: int = 100_000,
+        max_in_memory: Optional[int] = 10_000
+    ):
+        """
+        Args:
+            sink_path: Append-only JSON-lines file; entries are flushed in batches
+                by a background thread. None keeps logs in memory only.
+            batch_size: Maximum entries written per flush
+            flush_interval: Seconds to wait for a full batch before flushing
+            max_pending: Unflushed entries before log_action blocks (backpressure)
+            max_in_memory: Recent entries kept in self.logs and the lookup indexes;
+                older ones survive only in the sink. None keeps everything.
+                Ignored without a sink, where eviction would lose entries.
+        """
         self.logs: List[AuditLogEntry] = []
+        # Secondary indexes, in insertion (= time) order
+        self._timestamps: List[datetime] = []
+        self._by_user: Dict[str, List[AuditLogEntry]] = defaultdict(list)
+        self._by_resource: Dict[Tuple[str, str], List[AuditLogEntry]] = defaultdict(list)
+        # Never evict from the only copy of the audit trail
+        self.max_in_memory = max_in_memory if sink_path else None
+        # Timestamp of the newest evicted entry; older ranges are read from the sink
+        self._evicted_until: Optional[datetime] = None
+        self.sink_path = sink_path
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        # Entries whose write failed, retried ahead of the next batch
+        self._failed: List[AuditLogEntry] = []
+        self._write_lock = threading.Lock()
+        
+        if sink_path:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="audit-log-flusher", daemon=True
+            )
+            self._flusher.start()
     
     def log_action(
         self,
@@ -223,7 +394,8 @@ class AuditLogger:
         ip_address: str,
         user_agent: str,
         success: bool = True,
-        details: Optional[Dict] = None
+        details: Optional[Dict] = None,
+        secure_id: bool = False
     ) -> AuditLogEntry:
         """
         Log an action for audit trail
@@ -237,62 +409,227 @@ class AuditLogger:
             user_agent: User's browser/client
             success: Whether action was successful
             details: Additional details
+            secure_id: Use an unguessable random log ID instead of time/pid/sequence
             
         Returns:
             Created audit log entry
         """
+        now_ns = time.time_ns()
+        if secure_id:
+            log_id = f"log_{now_ns:x}_{secrets.token_hex(8)}"
+        else:
+            log_id = f"log_{now_ns:x}_{_pid:x}_{next(_log_counter):x}"
+        
+        # Repeated values (actions, resource types, user IDs, clients) share one str object
         log_entry = AuditLogEntry(
-            log_id=f"log_{datetime.now().timestamp()}_{secrets.token_hex(8)}",
-            user_id=user_id,
-            action=action,
-            resource_type=resource_type,
+            log_id=log_id,
+            user_id=_intern(user_id),
+            action=_intern(action),
+            resource_type=_intern(resource_type),
             resource_id=resource_id,
             ip_address=ip_address,
-            user_agent=user_agent,
-            timestamp=datetime.now(),
+            user_agent=_intern(user_agent),
+            timestamp=datetime.fromtimestamp(now_ns / 1e9),
             success=success,
             details=details or {}
         )
         
         self.logs.append(log_entry)
+        self._timestamps.append(log_entry.timestamp)
+        self._by_user[user_id].append(log_entry)
+        self._by_resource[(resource_type, resource_id)].append(log_entry)
+        if self.max_in_memory is not None and len(self.logs) > self.max_in_memory * 5 // 4:
+            self._evict(len(self.logs) - self.max_in_memory)
         
-        # In production: Write to secure, append-only log storage
-        self._persist_log(log_entry)
+        # Queued for the background flusher; blocks only if the sink falls behind
+        if self.sink_path:
+            self._enqueue(log_entry)
         
         return log_entry
     
-    def _persist_log(self, log_entry: AuditLogEntry):
-        """Persist log to secure storage"""
-        # Placeholder for log persistence
-        # In production: Write to database, file, or log aggregation service
-        pass
+    def _evict(self, count: int):
+        """Drop the oldest entries; trimming in chunks keeps appends amortized O(1)"""
+        evicted = self.logs[:count]
+        self._evicted_until = evicted[-1].timestamp
+        del self.logs[:count]
+        del self._timestamps[:count]
+        
+        # Evicted entries are the oldest, so they sit at the front of each index list
+        for index, counts in (
+            (self._by_user, Counter(log.user_id for log in evicted)),
+            (self._by_resource, Counter((log.resource_type, log.resource_id) for log in evicted)),
+        ):
+            for key, n in counts.items():
+                entries = index[key]
+                if n >= len(entries):
+                    del index[key]
+                else:
+                    del entries[:n]
+    
+    def _enqueue(self, log_entry: AuditLogEntry):
+        """Wait for queue space while the flusher is alive; write inline once it has stopped"""
+        while True:
+            flusher = self._flusher
+            if flusher is None or not flusher.is_alive():
+                self._write_batch([log_entry])
+                return
+            try:
+                self._pending.put(log_entry, timeout=self._flush_interval)
+                return
+            except queue.Full:
+                pass
+    
+    def _drain(self, block: bool) -> List[AuditLogEntry]:
+        """Take up to batch_size pending entries, waiting for the first if block"""
+        batch = []
+        try:
+            if block:
+                batch.append(self._pending.get(timeout=self._flush_interval))
+            while len(batch) < self._batch_size:
+                batch.append(self._pending.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+    
+    def _flush_loop(self):
+        """Background thread: write pending entries in batches"""
+        while not self._stop.is_set():
+            batch = self._drain(block=True)
+            if batch or self._failed:
+                self._write_batch(batch)
+        self.flush()
+    
+    def _write_batch(self, batch: List[AuditLogEntry]):
+        """Persist a batch after any earlier failures; on error keep it all for retry"""
+        with self._write_lock:
+            retrying = bool(self._failed)
+            batch = self._failed + batch
+            self._failed = []
+            try:
+                self._persist_log_batch(batch)
+            except Exception:
+                # Logged once per outage; the flusher retries every flush_interval
+                if not retrying:
+                    logger.exception(
+                        "Failed to write audit log entries to %s; holding them for retry",
+                        self.sink_path
+                    )
+                self._failed = batch
+                return
+            if retrying:
+                logger.warning("Audit log sink %s recovered; wrote %d entries", self.sink_path, len(batch))
+    
+    def _persist_log_batch(self, batch: List[AuditLogEntry]):
+        """Serialize a batch once and append it to the sink in a single write"""
+        if ORJSON_AVAILABLE:
+            # orjson serializes the dataclass (and its datetime) natively;
+            # anything else in details (Decimal, set, ...) is written as str
+            payload = b"".join(orjson.dumps(log, default=str) + b"\n" for log in batch)
+        else:
+            payload = "".join(json.dumps(log.to_dict(), default=str) + "\n" for log in batch).encode()
+        
+        with open(self.sink_path, 'ab') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def flush(self):
+        """Synchronously write everything still pending"""
+        if not self.sink_path:
+            return
+        while True:
+            batch = self._drain(block=False)
+            if not batch and not self._failed:
+                break
+            self._write_batch(batch)
+            if self._failed:
+                # Sink still failing; the entries stay held for a later flush
+                break
+    
+    def close(self):
+        """Stop the flusher thread after writing pending entries"""
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+        # Anything queued while the flusher was stopping
+        self.flush()
+        if self._failed:
+            logger.error(
+                "%d audit log entries could not be written to %s",
+                len(self._failed), self.sink_path
+            )
     
     def get_logs_for_user(self, user_id: str, limit: int = 100) -> List[AuditLogEntry]:
         """Get audit logs for a specific user"""
-        user_logs = [log for log in self.logs if log.user_id == user_id]
-        return sorted(user_logs, key=lambda x: x.timestamp, reverse=True)[:limit]
+        user_logs = self._by_user.get(user_id, [])
+        return user_logs[:-limit - 1:-1] if limit > 0 else []
     
     def get_logs_for_resource(self, resource_type: str, resource_id: str) -> List[AuditLogEntry]:
         """Get audit logs for a specific resource"""
-        return [
-            log for log in self.logs 
-            if log.resource_type == resource_type and log.resource_id == resource_id
-        ]
+        return list(self._by_resource.get((resource_type, resource_id), []))
     
-    def export_logs(self, start_date: datetime, end_date: datetime, filepath: str):
-        """Export audit logs for compliance reporting"""
-        filtered_logs = [
-            log for log in self.logs 
-            if start_date <= log.timestamp <= end_date
-        ]
+    def export_logs(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        filepath: str,
+        ndjson: bool = False
+    ):
+        """Export audit logs for compliance reporting (a JSON array, or one entry per line if ndjson)"""
+        if self._evicted_until is not None and start_date <= self._evicted_until:
+            # Part of the range is no longer in memory; the sink has the full history
+            filtered_logs = self._read_sink(start_date, end_date)
+        else:
+            start = bisect.bisect_left(self._timestamps, start_date)
+            end = bisect.bisect_right(self._timestamps, end_date)
+            filtered_logs = self.logs[start:end]
+        
+        if not ORJSON_AVAILABLE:
+            records = [log if isinstance(log, dict) else log.to_dict() for log in filtered_logs]
+            with open(filepath, 'w') as f:
+                if ndjson:
+                    f.writelines(json.dumps(record, default=str) + "\n" for record in records)
+                else:
+                    json.dump(records, f, indent=2, default=str)
+            return
         
-        with open(filepath, 'w') as f:
-            json.dump([log.to_dict() for log in filtered_logs], f, indent=2)
+        with open(filepath, 'wb') as f:
+            if ndjson:
+                f.writelines(orjson.dumps(log, default=str) + b"\n" for log in filtered_logs)
+            else:
+                f.write(orjson.dumps(filtered_logs, default=str, option=orjson.OPT_INDENT_2))
+    
+    def _read_sink(self, start_date: datetime, end_date: datetime) -> List[Dict]:
+        """Entries in [start_date, end_date] from the sink, plus any held for retry"""
+        self.flush()
+        loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+        records = []
+        with open(self.sink_path, 'rb') as f:
+            for line in f:
+                try:
+                    record = loads(line)
+                    timestamp = datetime.fromisoformat(record["timestamp"])
+                except (ValueError, KeyError, TypeError):
+                    continue  # a torn final line from a crash mid-write
+                if start_date <= timestamp <= end_date:
+                    records.append((timestamp, record))
+        with self._write_lock:
+            records.extend(
+                (log.timestamp, log.to_dict()) for log in self._failed
+                if start_date <= log.timestamp <= end_date
+            )
+        # Retried batches can land out of order
+        records.sort(key=lambda pair: pair[0])
+        return [record for _, record in records]
 
 
 class GDPRComplianceService:
     """GDPR/NDPR compliance features"""
     
+    # Only these fields survive anonymization (name, email, phone, IPs, etc. are dropped)
+    RETAINED_FIELDS = ('created_date', 'subscription_tier', 'country')
+    
     def __init__(self, encryption_service: EncryptionService):
         self.encryption_service = encryption_service
         self.data_retention_days = 365
@@ -309,22 +646,24 @@ class GDPRComplianceService:
         Returns:
             Anonymized data
         """
-        # Generate anonymous ID
-        anonymous_id = self.encryption_service.hash_sensitive_data(user_id)
-        
-        # Remove PII
-        anonymized = {
-            "anonymous_id": anonymous_id,
-            "created_date": user_data.get('created_date'),
-            "subscription_tier": user_data.get('subscription_tier'),
-            "country": user_data.get('country'),  # Keep general location
-            # Remove: name, email, phone, IP addresses, etc.
-        }
+        anonymized = {"anonymous_id": self.encryption_service.pseudonymize(user_id)}
+        anonymized.update({field: user_data.get(field) for field in self.RETAINED_FIELDS})
         
         self.anonymized_data[user_id] = anonymized
         
         return anonymized
     
+    def anonymize_users_bulk(self, users: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Anonymize many users at once ({user_id: user_data} -> {user_id: anonymized})"""
+        pseudonymize = self.encryption_service.pseudonymize
+        fields = self.RETAINED_FIELDS
+        anonymized = {
+            user_id: {"anonymous_id": pseudonymize(user_id), **{f: data.get(f) for f in fields}}
+            for user_id, data in users.items()
+        }
+        self.anonymized_data.update(anonymized)
+        return anonymized
+    
     def request_data_export(self, user_id: str) -> Dict:
         """
         Generate data export for user (GDPR right to data portability)
@@ -395,11 +734,22 @@ class GDPRComplianceService:
 class SecurityService:
     """Unified security service"""
     
-    def __init__(self, encryption_key: Optional[str] = None):
+    def __init__(self, encryption_key: Optional[str] = None, audit_log_path: Optional[str] = None):
         self.encryption = EncryptionService(encryption_key)
         self.rbac = RBACService()
-        self.audit = AuditLogger()
+        self.audit = AuditLogger(sink_path=audit_log_path)
         self.gdpr = GDPRComplianceService(self.encryption)
+        if audit_log_path:
+            # Queued audit entries would otherwise die with the daemon flusher
+            atexit.register(self.close)
+    
+    def flush(self):
+        """Write all queued audit entries to the sink"""
+        self.audit.flush()
+    
+    def close(self):
+        """Flush the audit log and stop its background writer"""
+        self.audit.close()
     
     def secure_api_request(
         self,
@@ -442,6 +792,44 @@ class SecurityService:
         )
         
         return True, None
+    
+    def secure_api_request_bulk(
+        self,
+        user_id: str,
+        checks: List[Tuple[Permission, str, str, str]],
+        request_data: Dict
+    ) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Secure several resource accesses in one request (e.g. a listing)
+        
+        Args:
+            user_id: User making the request
+            checks: (required_permission, action, resource_type, resource_id) per access
+            request_data: Request metadata (ip_address, user_agent)
+        
+        Returns:
+            (success, error_message) per check, in order
+        """
+        allowed = self.rbac.check_permissions_bulk(user_id, {check[0] for check in checks})
+        ip_address = request_data.get('ip_address', '')
+        user_agent = request_data.get('user_agent', '')
+        
+        results = []
+        for permission, action, resource_type, resource_id in checks:
+            granted = bool(allowed & PERM_BIT[permission])
+            # One entry per resource so get_logs_for_resource still sees every access
+            self.audit.log_action(
+                user_id=user_id,
+                action=action,
+                resource_type=resource_type,
+                resource_id=resource_id,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                success=granted,
+                details=None if granted else {"error": "permission_denied"}
+            )
+            results.append((True, None) if granted else (False, "Permission denied"))
+        return results
 
 
 # Example usage
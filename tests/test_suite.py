@@ -5,9 +5,30 @@ Targeting 90%+ code coverage with unit, integration, and E2E tests
 
 import pytest
 import asyncio
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Dict, Any
 import json
+import os
+import time
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def json_body(response) -> Any:
+    """Decode a response body, with orjson when available"""
+    return orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
+
+
+def json_content(data: Any) -> bytes:
+    """Encode a request body, with orjson when available"""
+    return orjson.dumps(data) if ORJSON_AVAILABLE else json.dumps(data).encode()
+
+
+JSON_HEADERS = {"content-type": "application/json"}
 
 
 # ================== Unit Tests for MFA Service ==================
@@ -15,78 +36,90 @@ import json
 class TestMFAService:
     """Test Multi-Factor Authentication service"""
     
-    @pytest.fixture
-    async def mfa_service(self):
+    @pytest.fixture(scope="module")
+    def mfa_service(self):
         from backend.services.security.mfa_service import MFAService
         return MFAService()
     
     @pytest.mark.asyncio
     async def test_generate_totp_secret(self, mfa_service):
         """Test TOTP secret generation"""
-        secret = await mfa_service.generate_totp_secret()
+        result = mfa_service.generate_totp_secret("user@example.com")
+        secret = result["secret"]
         
         assert secret is not None
         assert len(secret) == 32  # Base32 encoded
         assert secret.isalnum()
+        assert "user%40example.com" in result["provisioning_uri"]
     
     @pytest.mark.asyncio
     async def test_verify_totp_token(self, mfa_service):
-        """Test TOTP token verification"""
-        secret = await mfa_service.generate_totp_secret()
-        
-        # Generate current token
+        """Test TOTP token verification against pyotp"""
         import pyotp
+        secret = mfa_service.generate_totp_secret("user@example.com")["secret"]
         totp = pyotp.TOTP(secret)
-        current_token = totp.now()
         
-        # Verify token
-        is_valid = await mfa_service.verify_totp_token(secret, current_token)
-        assert is_valid is True
+        # Current token, as an authenticator app would show it
+        assert mfa_service.verify_totp(secret, totp.now()) is True
         
-        # Test invalid token
-        is_valid = await mfa_service.verify_totp_token(secret, "000000")
-        assert is_valid is False
+        # A token from well outside the drift window
+        now = time.time()
+        in_window = {totp.at(now + offset * 30) for offset in (-1, 0, 1)}
+        stale_token = totp.at(now - 10 * 30)
+        if stale_token not in in_window:
+            assert mfa_service.verify_totp(secret, stale_token) is False
+        
+        # Malformed input is rejected, not raised on
+        for token in ("١٢٣٤٥٦", "12345é", "12345", "1234567", ""):
+            assert mfa_service.verify_totp(secret, token) is False
     
     @pytest.mark.asyncio
     async def test_generate_backup_codes(self, mfa_service):
         """Test backup code generation"""
-        codes = await mfa_service.generate_backup_codes(count=10)
+        codes = mfa_service.generate_backup_codes(count=10)
         
         assert len(codes) == 10
+        assert len(set(codes)) == 10
         for code in codes:
-            assert len(code) == 12  # XXX-XXX-XXX format
-            assert code.count('-') == 2
+            assert len(code) == 9  # XXXX-XXXX format, from one token_hex draw
+            assert code.count('-') == 1
+            assert all(c in "0123456789ABCDEF" for c in code.replace('-', ''))
     
     @pytest.mark.asyncio
     async def test_verify_backup_code(self, mfa_service):
         """Test backup code verification"""
-        codes = await mfa_service.generate_backup_codes(count=5)
-        hashed_codes = [mfa_service._hash_code(code) for code in codes]
+        codes, hashed_codes = mfa_service.generate_hashed_backup_codes(count=5)
+        assert hashed_codes == mfa_service.hash_backup_codes(codes)
         
         # Test valid code
-        is_valid = await mfa_service.verify_backup_code(codes[0], hashed_codes)
+        is_valid = mfa_service.verify_backup_code(codes[0], hashed_codes[0])
         assert is_valid is True
         
         # Test invalid code
-        is_valid = await mfa_service.verify_backup_code("XXX-XXX-XXX", hashed_codes)
+        is_valid = mfa_service.verify_backup_code("XXXX-XXXX", hashed_codes[0])
         assert is_valid is False
     
     @pytest.mark.asyncio
     async def test_device_fingerprint(self, mfa_service):
         """Test device fingerprinting"""
-        fingerprint1 = await mfa_service.generate_device_fingerprint(
+        fingerprint1 = mfa_service.generate_device_fingerprint(
             "Mozilla/5.0", "192.168.1.1"
         )
-        fingerprint2 = await mfa_service.generate_device_fingerprint(
+        fingerprint2 = mfa_service.generate_device_fingerprint(
             "Mozilla/5.0", "192.168.1.1"
         )
-        fingerprint3 = await mfa_service.generate_device_fingerprint(
+        fingerprint3 = mfa_service.generate_device_fingerprint(
             "Chrome/91.0", "192.168.1.2"
         )
         
         assert fingerprint1 == fingerprint2
         assert fingerprint1 != fingerprint3
         assert len(fingerprint1) == 64  # SHA-256 hex
+        
+        result = mfa_service.validate_device_fingerprint(
+            "Mozilla/5.0", "192.168.1.1", stored_fingerprint=fingerprint1
+        )
+        assert result["is_trusted"] is True
 
 
 # ================== Unit Tests for Encryption Service ==================
@@ -94,44 +127,61 @@ class TestMFAService:
 class TestEncryptionService:
     """Test Advanced Encryption service"""
     
-    @pytest.fixture
-    async def encryption_service(self):
+    @pytest.fixture(scope="module")
+    def encryption_service(self):
         from backend.services.security.encryption_service import AdvancedEncryptionService
         return AdvancedEncryptionService()
     
     @pytest.mark.asyncio
     async def test_symmetric_encryption(self, encryption_service):
-        """Test Fernet symmetric encryption"""
+        """Test AES-256-GCM symmetric field encryption"""
+        import base64
+        from cryptography.exceptions import InvalidTag
         plaintext = "Sensitive user data"
         
-        encrypted = await encryption_service.encrypt_symmetric(plaintext)
-        decrypted = await encryption_service.decrypt_symmetric(encrypted)
+        encrypted = encryption_service.encrypt_field(plaintext)
+        decrypted = encryption_service.decrypt_field(encrypted)
         
         assert decrypted == plaintext
         assert encrypted != plaintext
+        # Fresh nonce per call
+        assert encryption_service.encrypt_field(plaintext) != encrypted
+        
+        # Tampered ciphertext fails authentication
+        token = bytearray(base64.urlsafe_b64decode(encrypted))
+        token[-1] ^= 1
+        with pytest.raises(InvalidTag):
+            encryption_service.decrypt_field(base64.urlsafe_b64encode(bytes(token)).decode())
     
     @pytest.mark.asyncio
     async def test_aes_gcm_encryption(self, encryption_service):
-        """Test AES-256-GCM authenticated encryption"""
-        plaintext = "Top secret information"
-        key = encryption_service._generate_aes_key()
+        """Test AES-256-GCM authenticated encryption, one message and a batch"""
+        plaintext = b"Top secret information"
+        key = os.urandom(32)
         
-        encrypted = await encryption_service.encrypt_aes_gcm(plaintext, key)
-        decrypted = await encryption_service.decrypt_aes_gcm(encrypted, key)
+        encrypted = encryption_service.encrypt_with_aes_256_bytes(plaintext, key)
+        assert encryption_service.decrypt_with_aes_256_bytes(encrypted, key) == plaintext
         
-        assert decrypted == plaintext
+        # 64 payloads sealed in one OpenSSL call
+        plaintexts = [f"secret {i}".encode() * (i % 5) for i in range(64)]
+        blob = encryption_service.encrypt_with_aes_256_batch(plaintexts, key)
+        assert encryption_service.decrypt_with_aes_256_batch(blob, key) == plaintexts
     
     @pytest.mark.asyncio
-    async def test_rsa_encryption(self, encryption_service):
+    async def test_rsa_encryption(self, encryption_service, rsa_keypair):
         """Test RSA asymmetric encryption"""
-        public_key, private_key = await encryption_service.generate_rsa_keypair()
-        plaintext = "Asymmetrically encrypted message"
+        plaintext = b"Asymmetrically encrypted message"
         
-        encrypted = await encryption_service.encrypt_rsa(plaintext, public_key)
-        decrypted = await encryption_service.decrypt_rsa(encrypted, private_key)
+        encrypted = encryption_service.encrypt_with_public_key(plaintext, rsa_keypair["public_key"])
+        decrypted = encryption_service.decrypt_with_private_key(encrypted, rsa_keypair["private_key"])
         
         assert decrypted == plaintext
     
+    def test_rsa_invalid_key_size(self, encryption_service):
+        """Undersized RSA keys are rejected, not queued"""
+        with pytest.raises(ValueError):
+            encryption_service.generate_rsa_keypair(key_size=256)
+    
     @pytest.mark.asyncio
     async def test_field_level_encryption(self, encryption_service):
         """Test field-level encryption for databases"""
@@ -142,7 +192,7 @@ class TestEncryptionService:
         }
         fields_to_encrypt = ["email", "phone"]
         
-        encrypted_data = await encryption_service.encrypt_fields(data, fields_to_encrypt)
+        encrypted_data = encryption_service.encrypt_fields(data, fields_to_encrypt)
         
         # Check encryption
         assert encrypted_data["email"] != data["email"]
@@ -150,7 +200,7 @@ class TestEncryptionService:
         assert encrypted_data["public_info"] == data["public_info"]
         
         # Decrypt
-        decrypted_data = await encryption_service.decrypt_fields(
+        decrypted_data = encryption_service.decrypt_fields(
             encrypted_data, fields_to_encrypt
         )
         assert decrypted_data == data
@@ -193,8 +243,8 @@ class TestMultiModelEnsemble:
 class TestDataQualityPipeline:
     """Test Data Validation and Quality Pipeline"""
     
-    @pytest.fixture
-    async def spam_detector(self):
+    @pytest.fixture(scope="module")
+    def spam_detector(self):
         from backend.services.validation.data_quality_pipeline import SpamBotDetector
         return SpamBotDetector()
     
@@ -217,6 +267,26 @@ class TestDataQualityPipeline:
         assert is_spam is False
         assert confidence < 60.0
     
+    @pytest.mark.asyncio
+    async def test_hyperscan_matches_re_fallback(self, spam_detector, monkeypatch):
+        """Test the Hyperscan scan and the pure-re fallback give identical verdicts"""
+        pytest.importorskip("hyperscan")
+        from backend.services.validation import data_quality_pipeline
+        
+        monkeypatch.setattr(data_quality_pipeline, "HYPERSCAN_AVAILABLE", False)
+        fallback = data_quality_pipeline.SpamBotDetector()
+        assert spam_detector._hs_db is not None and fallback._hs_db is None
+        
+        contents = [
+            "BUY NOW! Limited time offer! Click here to earn money fast!",
+            "Our company is launching a new product next month.",
+            "WINNER!!!!!!!!!!!! http://a.xyzhttp://b.xyzhttp://c.xyz",
+            "Café crème — ÉNORME SUCCÈS AUJOURD'HUI POUR TOUTE L'ÉQUIPE",
+        ]
+        for content in contents:
+            assert await spam_detector.detect_spam(content) == await fallback.detect_spam(content)
+        assert spam_detector.detect_spam_batch(contents) == fallback.detect_spam_batch(contents)
+    
     @pytest.mark.asyncio
     async def test_url_verification(self):
         """Test URL credibility verification"""
@@ -233,22 +303,195 @@ class TestDataQualityPipeline:
         assert trust_score < 60.0
 
 
+# ================== Unit Tests for Cross-Lingual Service ==================
+
+class TestCrossLingualService:
+    """Test multilingual mention processing"""
+    
+    @pytest.fixture
+    async def multilingual_service(self):
+        from backend.services.multilingual.cross_lingual_service import CrossLingualService
+        return CrossLingualService()
+    
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_processing(self, multilingual_service):
+        """Test batch processing preserves order and per-mention results"""
+        mentions = [
+            {"content": "bonjour le monde et la des"},
+            {"content": "The company is doing great"},
+            {"content": "der die das und ist"},
+            {"content": "merci le et un une"},
+        ]
+        
+        batch = await multilingual_service.process_multilingual_mentions(mentions)
+        
+        assert len(batch) == len(mentions)
+        for mention, result in zip(mentions, batch):
+            single = await multilingual_service.process_multilingual_mention(mention)
+            assert result["original_content"] == mention["content"]
+            assert result["detected_language"] == single["detected_language"]
+            assert result["translation"] == single["translation"]
+            assert result["sentiment"] == single["sentiment"]
+
+
+# ================== Unit Tests for Notification Service ==================
+
+class TestFreeNotificationService:
+    """Test FREE-tier notification delivery"""
+    
+    @pytest.fixture
+    async def notif_service(self):
+        from backend.services.notifications.free_notification_service import FreeNotificationService
+        return FreeNotificationService()
+    
+    @pytest.mark.asyncio
+    async def test_send_alert_dispatches_channels_concurrently(self, notif_service):
+        """Test all enabled channels are sent concurrently and failures map to False"""
+        from backend.services.notifications.free_notification_service import (
+            Notification, NotificationPreferences, NotificationPriority
+        )
+        
+        async def slow_success(*args, **kwargs):
+            await asyncio.sleep(0.1)
+            return True
+        
+        async def failing(*args, **kwargs):
+            raise RuntimeError("provider down")
+        
+        notif_service.send_email = slow_success
+        notif_service.send_sms = failing
+        notif_service.send_push = slow_success
+        
+        preferences = NotificationPreferences(
+            user_id="user_1",
+            email="user@example.com",
+            phone="+1234567890",
+            push_token="token",
+            sms_enabled=True
+        )
+        notification = Notification(
+            user_id="user_1",
+            title="Threat",
+            message="Details",
+            priority=NotificationPriority.CRITICAL,
+            data={}
+        )
+        
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await notif_service.send_alert(preferences, notification)
+        elapsed = loop.time() - start
+        
+        assert results == {"email": True, "sms": False, "push": True}
+        assert elapsed < 0.2
+    
+    @pytest.mark.asyncio
+    async def test_non_critical_pushes_are_coalesced(self, notif_service):
+        """Test a burst of non-critical alerts shares one multicast push"""
+        from backend.services.notifications.free_notification_service import (
+            Notification, NotificationPreferences, NotificationPriority
+        )
+        
+        bulk_calls = []
+        
+        async def fake_bulk(tokens, title, message, data=None):
+            bulk_calls.append(list(tokens))
+            return [True] * len(tokens)
+        
+        notif_service.send_push_bulk = fake_bulk
+        
+        notification = Notification(
+            user_id="broadcast",
+            title="Threat",
+            message="Details",
+            priority=NotificationPriority.MEDIUM,
+            data={"severity": "medium"}
+        )
+        preferences = [
+            NotificationPreferences(user_id=f"user_{i}", push_token=f"token_{i}")
+            for i in range(10)
+        ]
+        
+        results = await asyncio.gather(*(
+            notif_service.send_alert(prefs, notification) for prefs in preferences
+        ))
+        await notif_service.aclose()
+        
+        assert all(result == {"push": True} for result in results)
+        assert len(bulk_calls) == 1
+        assert sorted(bulk_calls[0]) == sorted(p.push_token for p in preferences)
+    
+    @pytest.mark.asyncio
+    async def test_daily_email_limit_under_concurrency(self, notif_service):
+        """Test concurrent sends never exceed the daily quota and the window resets"""
+        async def fake_batch(recipients, subject, message, html_content):
+            await asyncio.sleep(0)
+            return [True] * len(recipients)
+        
+        notif_service.sendgrid_api_key = "test-key"
+        notif_service._send_email_batch = fake_batch
+        
+        results = await asyncio.gather(*(
+            notif_service.send_email(f"user{i}@example.com", "Subject", "Body")
+            for i in range(150)
+        ))
+        
+        assert sum(results) == 100
+        assert notif_service.emails_sent_today == 100
+        
+        notif_service._stats_window_start -= timedelta(hours=24)
+        assert await notif_service.send_email("late@example.com", "Subject", "Body") is True
+        assert notif_service.emails_sent_today == 1
+    
+    @pytest.mark.asyncio
+    async def test_duplicate_threat_alerts_suppressed(self, notif_service):
+        """Test repeated non-critical threats are deduplicated but critical ones are not"""
+        from backend.services.notifications.free_notification_service import NotificationPreferences
+        
+        sent = []
+        
+        async def fake_send_alert(preferences, notification):
+            sent.append(notification)
+            return {"push": True}
+        
+        notif_service.send_alert = fake_send_alert
+        preferences = NotificationPreferences(user_id="user_1", push_token="token")
+        threat = {
+            "threat_type": "Impersonation",
+            "severity": "high",
+            "message": "Fake profile detected",
+            "source_url": "https://example.com/fake"
+        }
+        
+        assert await notif_service.send_threat_alert(preferences, threat) == {"push": True}
+        assert await notif_service.send_threat_alert(preferences, threat) == {}
+        assert await notif_service.send_threat_alert(
+            preferences, {**threat, "severity": "critical"}
+        ) == {"push": True}
+        
+        assert len(sent) == 2
+        assert notif_service.get_daily_stats()["alerts_suppressed"] == 1
+
+
 # ================== Integration Tests ==================
 
+@pytest.fixture(scope="module")
+def client():
+    """One app client per module; startup/shutdown events run once"""
+    from fastapi.testclient import TestClient
+    from backend.main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
 class TestAPIIntegration:
     """Integration tests for API endpoints"""
     
-    @pytest.fixture
-    async def client(self):
-        from fastapi.testclient import TestClient
-        from backend.main import app
-        return TestClient(app)
-    
     def test_health_endpoint(self, client):
         """Test health check endpoint"""
         response = client.get("/health")
         assert response.status_code == 200
-        assert response.json()["status"] == "healthy"
+        assert json_body(response)["status"] == "healthy"
     
     def test_create_entity(self, client):
         """Test entity creation endpoint"""
@@ -258,9 +501,11 @@ class TestAPIIntegration:
             "description": "Test entity for integration testing"
         }
         
-        response = client.post("/api/v1/entities", json=entity_data)
+        response = client.post(
+            "/api/v1/entities", content=json_content(entity_data), headers=JSON_HEADERS
+        )
         assert response.status_code == 201
-        assert response.json()["name"] == entity_data["name"]
+        assert json_body(response)["name"] == entity_data["name"]
     
     def test_authentication_required(self, client):
         """Test that protected endpoints require authentication"""
@@ -270,53 +515,67 @@ class TestAPIIntegration:
 
 # ================== Performance Tests ==================
 
+NS_PER_MS = 1_000_000
+NS_PER_S = 1_000_000_000
+
+
 class TestPerformance:
     """Performance and load tests"""
     
+    @pytest.fixture
+    async def async_client(self):
+        import httpx
+        from backend.main import app
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+    
     @pytest.mark.asyncio
-    async def test_concurrent_requests(self):
+    async def test_concurrent_requests(self, async_client):
         """Test system under concurrent load"""
-        from backend.services.ai_analytics.multi_model_ensemble import MultiModelAIEnsemble
-        
-        ensemble = MultiModelAIEnsemble("test-key", "test-key")
-        
-        # Simulate 100 concurrent requests
-        tasks = []
-        for i in range(100):
-            # Mock task - would be actual API calls in production
-            tasks.append(asyncio.sleep(0.01))
-        
-        start_time = datetime.utcnow()
-        await asyncio.gather(*tasks)
-        end_time = datetime.utcnow()
-        
-        duration = (end_time - start_time).total_seconds()
+        # 100 concurrent requests through the full ASGI stack
+        start = time.perf_counter_ns()
+        responses = await asyncio.gather(*(async_client.get("/health") for _ in range(100)))
+        elapsed_ns = time.perf_counter_ns() - start
         
+        assert all(response.status_code == 200 for response in responses)
         # Should handle 100 concurrent requests within reasonable time
-        assert duration < 5.0  # 5 seconds max
+        assert elapsed_ns < 5 * NS_PER_S  # 5 seconds max
     
     @pytest.mark.asyncio
-    async def test_api_response_time(self):
+    async def test_api_response_time(self, async_client):
         """Test API response time meets SLA (<100ms p95)"""
-        # Simplified test - would use actual HTTP requests in production
-        response_times = []
-        
-        for _ in range(100):
-            start = datetime.utcnow()
-            await asyncio.sleep(0.01)  # Simulate API call
-            end = datetime.utcnow()
-            response_times.append((end - start).total_seconds() * 1000)
-        
-        # Calculate p95
-        response_times.sort()
-        p95_index = int(len(response_times) * 0.95)
-        p95_latency = response_times[p95_index]
-        
-        assert p95_latency < 100  # <100ms SLA
+        import numpy as np
+        n = 100
+        
+        async def timed_request():
+            start = time.perf_counter_ns()
+            response = await async_client.get("/health")
+            assert response.status_code == 200
+            return time.perf_counter_ns() - start
+        
+        # Latency of each request while all n are in flight
+        response_times = np.fromiter(
+            await asyncio.gather(*(timed_request() for _ in range(n))),
+            dtype=np.int64, count=n
+        )  # nanoseconds
+        
+        # Calculate p95 (partial sort, O(n))
+        p95_index = int(n * 0.95)
+        p95_latency_ms = np.partition(response_times, p95_index)[p95_index] / NS_PER_MS
+        
+        assert p95_latency_ms < 100  # <100ms SLA
 
 
 # ================== Security Tests ==================
 
+SQLI_PAYLOAD_JSON = json.dumps({
+    "name": "'; DROP TABLE users; --",
+    "entity_type": "company"
+}).encode()
+XSS_PAYLOAD = "<script>alert('XSS')</script>"
+
+
 class TestSecurity:
     """Security and penetration tests"""
     
@@ -342,12 +601,11 @@ class TestSecurity:
     async def test_sql_injection_prevention(self, client):
         """Test SQL injection prevention"""
         # Attempt SQL injection
-        malicious_input = "'; DROP TABLE users; --"
-        
-        response = client.post("/api/v1/entities", json={
-            "name": malicious_input,
-            "entity_type": "company"
-        })
+        response = client.post(
+            "/api/v1/entities",
+            content=SQLI_PAYLOAD_JSON,
+            headers=JSON_HEADERS
+        )
         
         # Should not cause error and should sanitize input
         assert response.status_code in [201, 400]  # Created or validation error
@@ -359,9 +617,8 @@ class TestSecurity:
         
         pipeline = DataQualityPipeline()
         
-        xss_content = "<script>alert('XSS')</script>"
         result = await pipeline.validate_mention({
-            "content": xss_content,
+            "content": XSS_PAYLOAD,
             "source_url": "https://example.com"
         })
         
@@ -372,11 +629,11 @@ class TestSecurity:
 # ================== Test Configuration ==================
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for async tests"""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+def rsa_keypair():
+    """One RSA keypair for the whole run (key generation is the slowest crypto op)"""
+    from backend.services.security.encryption_service import AdvancedEncryptionService
+    # Test-only key size: the round-trip, not key strength, is under test
+    return AdvancedEncryptionService().generate_rsa_keypair(key_size=1024)
 
 
 # ================== Test Runner Configuration ==================
@@ -388,5 +645,6 @@ if __name__ == "__main__":
         "--cov=backend",  # Coverage for backend
         "--cov-report=html",  # HTML coverage report
         "--cov-report=term-missing",  # Show missing lines
-        "--asyncio-mode=auto"  # Auto async mode
+        "-n", "auto",  # One pytest-xdist worker per core
+        "--dist=loadscope"  # Shard by test class
     ])